@@ -1,6 +1,7 @@
 """
 Setup script for PacketClaude
 """
+import os
 from setuptools import setup, find_packages
 from pathlib import Path
 
@@ -8,6 +9,13 @@ from pathlib import Path
 readme_file = Path(__file__).parent / "README.md"
 long_description = readme_file.read_text() if readme_file.exists() else ""
 
+# Optional native build of the per-frame AX.25 codec:
+#   PACKETCLAUDE_MYPYC=1 pip install .
+ext_modules = []
+if os.environ.get("PACKETCLAUDE_MYPYC") == "1":
+    from mypyc.build import mypycify
+    ext_modules = mypycify(["src/packetclaude/ax25/protocol.py"])
+
 setup(
     name="packetclaude",
     version="0.1.0",
@@ -18,6 +26,7 @@ setup(
     url="https://github.com/yourusername/packetclaude",
     packages=find_packages(where="src"),
     package_dir={"": "src"},
+    ext_modules=ext_modules,
     python_requires=">=3.11",
     install_requires=[
         "anthropic>=0.39.0",
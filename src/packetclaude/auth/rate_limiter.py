@@ -3,12 +3,31 @@ Rate limiting for packet radio access
 """
 import logging
 import re
-from typing import Optional, Tuple
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
 from ..database import Database
 
 
 logger = logging.getLogger(__name__)
 
+# Telnet connection identifier (IP:port)
+# IPv4: nnn.nnn.nnn.nnn:port
+# IPv6: [xxxx:xxxx:...]:port
+TELNET_ID_RE = re.compile(r'^(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}:\d+)|(\[[\da-fA-F:]+\]:\d+)$')
+
+# Basic amateur radio callsign: 1-2 characters, digit, 1-4 characters, optional -SSID
+CALLSIGN_RE = re.compile(r'^[A-Z0-9]{1,2}[0-9][A-Z0-9]{1,4}(-[0-9]{1,2})?$')
+
+# Most per-callsign query windows kept in memory; least recently used ones
+# are re-seeded from the database if their station comes back
+MAX_BUCKETS = 4096
+
+# Rate limit window lengths in seconds
+HOUR = 3600
+DAY = 86400
+
 
 class RateLimiter:
     """
@@ -33,12 +52,25 @@ class RateLimiter:
         self.queries_per_day = queries_per_day
         self.enabled = enabled
 
-    def check_limit(self, callsign: str) -> Tuple[bool, Optional[str]]:
+        # In-memory sliding windows: callsign -> [hour_stamps, day_stamps, last_used],
+        # each a deque of time.monotonic() query times, oldest first.
+        # Seeded from the database on first use, so the check needs no SQL.
+        # Kept in least-recently-used order, so the oldest entry is first.
+        self._buckets: 'OrderedDict[str, List]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Rejected queries per callsign since the last pop_rejections()
+        self._rejections: Dict[str, int] = {}
+
+    def check_limit(self, callsign: str,
+                    pending: Optional[Callable[[], int]] = None) -> Tuple[bool, Optional[str]]:
         """
-        Check if callsign is within rate limits
+        Check if callsign is within rate limits, consuming one query if allowed
 
         Args:
             callsign: Station callsign
+            pending: Returns the count of recent queries not yet written to
+                the database; only called when the callsign isn't cached
 
         Returns:
             Tuple of (allowed: bool, reason: str if not allowed)
@@ -46,28 +78,152 @@ class RateLimiter:
         if not self.enabled:
             return True, None
 
-        # Validate callsign format first
-        if not self.is_valid_callsign(callsign):
-            return False, "Invalid callsign format"
+        callsign = callsign.upper()
+        now = time.monotonic()
+
+        with self._lock:
+            # Only unseen callsigns need format validation
+            if callsign not in self._buckets and not self.is_valid_callsign(callsign):
+                return False, "Invalid callsign format"
+
+            hour, day = self._windows(callsign, now, pending)
+
+            if len(hour) >= self.queries_per_hour:
+                reason = f"Hourly limit reached ({self.queries_per_hour}/hour)"
+            elif len(day) >= self.queries_per_day:
+                reason = f"Daily limit reached ({self.queries_per_day}/day)"
+            else:
+                hour.append(now)
+                day.append(now)
+                return True, None
+
+            rejected = self._rejections.get(callsign, 0) + 1
+            self._rejections[callsign] = rejected
+
+        # Only the first rejection is logged; bursts are summarized by the caller
+        if rejected == 1:
+            logger.warning(f"Rate limit exceeded for {callsign}: {reason}")
+        return False, reason
+
+    def _windows(self, callsign: str, now: float,
+                 pending: Optional[Callable[[], int]]) -> Tuple[Deque[float], Deque[float]]:
+        """
+        Get a callsign's current query windows, seeding them if needed
+
+        Must be called with self._lock held.
+
+        Args:
+            callsign: Station callsign (uppercase)
+            now: Current time.monotonic()
+            pending: As for check_limit()
+
+        Returns:
+            Tuple of (hour_stamps, day_stamps), pruned to their windows
+        """
+        bucket = self._buckets.get(callsign)
+
+        if bucket is None:
+            bucket = self._seed(callsign, now, pending() if pending else 0)
+            self._buckets[callsign] = bucket
+            if len(self._buckets) > MAX_BUCKETS:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(callsign)
+
+        hour, day = bucket[0], bucket[1]
+        bucket[2] = now
+
+        # Drop stamps that have left each window
+        while hour and hour[0] <= now - HOUR:
+            hour.popleft()
+        while day and day[0] <= now - DAY:
+            day.popleft()
+
+        return hour, day
+
+    def _seed(self, callsign: str, now: float, pending: int) -> List:
+        """
+        Build a callsign's query windows from its logged queries
+
+        The database only gives counts, so stamps are placed conservatively:
+        queries from the last hour (and unflushed ones) count as just made,
+        and the rest of the day's as made an hour ago.
+
+        Args:
+            callsign: Station callsign
+            now: Current time.monotonic()
+            pending: Recent queries not yet written to the database
 
-        # Check database for rate limits
-        allowed, reason = self.database.check_rate_limit(
-            callsign.upper(),
+        Returns:
+            [hour_stamps, day_stamps, last_used]
+        """
+        status = self.database.get_rate_limit_status(
+            callsign,
             self.queries_per_hour,
             self.queries_per_day
         )
+        recent = status['hourly_used'] + pending
+        earlier = max(0, status['daily_used'] - status['hourly_used'])
 
-        if not allowed:
-            logger.warning(f"Rate limit exceeded for {callsign}: {reason}")
+        hour: Deque[float] = deque([now] * recent)
+        day: Deque[float] = deque([now - HOUR] * earlier + [now] * recent)
+        return [hour, day, now]
 
-        return allowed, reason
+    def pop_rejections(self) -> Dict[str, int]:
+        """
+        Get and reset the count of rejected queries per callsign
 
-    def get_status(self, callsign: str) -> dict:
+        Returns:
+            Dictionary of callsign -> rejected query count
+        """
+        with self._lock:
+            rejections = self._rejections
+            self._rejections = {}
+        return rejections
+
+    def refund(self, callsign: str):
+        """
+        Give back a query consumed by check_limit (e.g. the query failed)
+
+        Args:
+            callsign: Station callsign
+        """
+        with self._lock:
+            bucket = self._buckets.get(callsign.upper())
+            if bucket:
+                # The refunded query is the most recent one in both windows
+                if bucket[0]:
+                    bucket[0].pop()
+                if bucket[1]:
+                    bucket[1].pop()
+
+    def cleanup_buckets(self, max_idle: int = 3600):
+        """
+        Drop query windows that have not been used recently
+
+        Dropped callsigns are re-seeded from the database on their next query.
+
+        Args:
+            max_idle: Idle time in seconds before a window is dropped
+        """
+        cutoff = time.monotonic() - max_idle
+        with self._lock:
+            # Buckets are in last-use order, so stop at the first fresh one
+            buckets = self._buckets
+            while buckets and next(iter(buckets.values()))[2] < cutoff:
+                buckets.popitem(last=False)
+
+    def get_status(self, callsign: str,
+                   pending: Optional[Callable[[], int]] = None) -> dict:
         """
         Get rate limit status for callsign
 
+        Counts come from the same in-memory windows check_limit() admits
+        against, so they include queries not yet flushed to the database.
+
         Args:
             callsign: Station callsign
+            pending: As for check_limit()
 
         Returns:
             Dictionary with rate limit information
@@ -78,14 +234,20 @@ class RateLimiter:
                 'message': 'Rate limiting disabled'
             }
 
-        status = self.database.get_rate_limit_status(
-            callsign.upper(),
-            self.queries_per_hour,
-            self.queries_per_day
-        )
-
-        status['enabled'] = True
-        return status
+        with self._lock:
+            hour, day = self._windows(callsign.upper(), time.monotonic(), pending)
+            hourly_used = len(hour)
+            daily_used = len(day)
+
+        return {
+            'enabled': True,
+            'hourly_used': hourly_used,
+            'hourly_limit': self.queries_per_hour,
+            'hourly_remaining': max(0, self.queries_per_hour - hourly_used),
+            'daily_used': daily_used,
+            'daily_limit': self.queries_per_day,
+            'daily_remaining': max(0, self.queries_per_day - daily_used),
+        }
 
     @staticmethod
     def is_valid_callsign(callsign: str) -> bool:
@@ -99,20 +261,10 @@ class RateLimiter:
             True if valid format
         """
         # Check if this is a telnet connection (IP:port format)
-        # IPv4: nnn.nnn.nnn.nnn:port
-        # IPv6: [xxxx:xxxx:...]:port
-        telnet_pattern = r'^(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}:\d+)|(\[[\da-fA-F:]+\]:\d+)$'
-        if re.match(telnet_pattern, callsign):
+        if TELNET_ID_RE.match(callsign):
             return True
 
-        # Basic amateur radio callsign validation
-        # Format: 1-2 characters, digit, 1-4 characters, optional -SSID
-        pattern = r'^[A-Z0-9]{1,2}[0-9][A-Z0-9]{1,4}(-[0-9]{1,2})?$'
-
-        callsign_upper = callsign.upper().strip()
-        match = re.match(pattern, callsign_upper)
-
-        return match is not None
+        return CALLSIGN_RE.match(callsign.upper().strip()) is not None
 
     def format_limit_message(self, status: dict) -> str:
         """
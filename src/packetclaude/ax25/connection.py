@@ -3,10 +3,11 @@ AX.25 connection handler
 Manages connected-mode AX.25 sessions with multiple clients
 """
 import logging
+import sys
 import time
-from typing import Dict, Optional, Callable
+from typing import Dict, Optional, Callable, List
 from enum import Enum
-from .protocol import AX25Frame, parse_callsign
+from .protocol import AX25Frame
 from .kiss import KISSClient
 from .yapp import YAPPManager, YAPPControl
 
@@ -25,6 +26,13 @@ class ConnectionState(Enum):
 class AX25Connection:
     """Represents a single AX.25 connection"""
 
+    __slots__ = (
+        'remote_callsign', 'remote_ssid', 'local_callsign', 'local_ssid',
+        'remote_address', 'local_address', 'state', 'connected_at',
+        'connected_mono', 'last_activity', 'packets_sent', 'packets_received',
+        'in_yapp_mode', 'connection_id', 'ui_header',
+    )
+
     def __init__(self, remote_callsign: str, remote_ssid: int,
                  local_callsign: str, local_ssid: int):
         """
@@ -42,24 +50,40 @@ class AX25Connection:
         self.local_ssid = local_ssid
         self.state = ConnectionState.DISCONNECTED
         self.connected_at: Optional[float] = None
-        self.last_activity: float = time.time()
+        self.connected_mono: Optional[float] = None  # monotonic, for durations
+        self.last_activity: float = time.monotonic()  # monotonic, for stale checks
         self.packets_sent = 0
         self.packets_received = 0
         self.in_yapp_mode = False  # Flag for YAPP file transfer mode
+        self.connection_id: Optional[int] = None
+
+        # Address strings are read on every frame; the callsigns never change.
+        # Interned because they key the session, pending and rate-limit dicts.
+        self.remote_address = sys.intern(f"{remote_callsign}-{remote_ssid}"
+                                         if remote_ssid else remote_callsign)
+        self.local_address = (f"{local_callsign}-{local_ssid}"
+                              if local_ssid else local_callsign)
+
+        # Encoded UI frame header for data we send; the addresses never change
+        self.ui_header = AX25Frame.encode_ui_header(
+            remote_callsign, local_callsign, remote_ssid, local_ssid
+        )
+
+    def drain(self, timeout: float = 1.0) -> bool:
+        """
+        Make sure data already sent goes out before a disconnect
 
-    @property
-    def remote_address(self) -> str:
-        """Get remote address string"""
-        if self.remote_ssid:
-            return f"{self.remote_callsign}-{self.remote_ssid}"
-        return self.remote_callsign
+        Data frames and the DISC share the KISS socket and are written in
+        order under its lock, so the TNC always transmits queued data first
+        and there is nothing to wait for.
 
-    @property
-    def local_address(self) -> str:
-        """Get local address string"""
-        if self.local_ssid:
-            return f"{self.local_callsign}-{self.local_ssid}"
-        return self.local_callsign
+        Args:
+            timeout: Unused; matches TelnetConnection.drain()
+
+        Returns:
+            True
+        """
+        return True
 
     def __str__(self):
         return f"{self.remote_address} ({self.state.value})"
@@ -70,6 +94,9 @@ class AX25ConnectionHandler:
     Handles multiple AX.25 connections
     """
 
+    # Maximum data bytes per I/UI frame (AX.25 allows up to 256)
+    PACLEN = 200
+
     def __init__(self, kiss_client: KISSClient,
                  local_callsign: str,
                  local_ssid: int = 10):
@@ -146,7 +173,8 @@ class AX25ConnectionHandler:
         # Update state
         conn.state = ConnectionState.CONNECTED
         conn.connected_at = time.time()
-        conn.last_activity = time.time()
+        conn.connected_mono = time.monotonic()
+        conn.last_activity = conn.connected_mono
 
         # Send UA (Unnumbered Acknowledge) - respond as the callsign they connected to
         ua_frame = AX25Frame.create_ua_frame(
@@ -201,7 +229,7 @@ class AX25ConnectionHandler:
         else:
             conn = self.connections[remote_key]
 
-        conn.last_activity = time.time()
+        conn.last_activity = time.monotonic()
         conn.packets_received += 1
 
         # Notify callback
@@ -227,7 +255,7 @@ class AX25ConnectionHandler:
             # Not connected, ignore or send DM
             return
 
-        conn.last_activity = time.time()
+        conn.last_activity = time.monotonic()
         conn.packets_received += 1
 
         # Check if this is YAPP data
@@ -255,19 +283,59 @@ class AX25ConnectionHandler:
             logger.error(f"Cannot send data: {connection} not connected")
             return False
 
-        # Create UI frame for simplicity (connectionless)
+        # Send as UI frame for simplicity (connectionless)
         # In a full implementation, would use I frames
-        frame = AX25Frame.create_ui_frame(
-            connection.remote_callsign,
-            connection.local_callsign,  # Use connection's local callsign
-            data,
-            connection.remote_ssid,
-            connection.local_ssid  # Use connection's local SSID
-        )
-
-        if self._send_frame(frame):
+        if self.kiss_client.send_frame(connection.ui_header + data):
             connection.packets_sent += 1
-            connection.last_activity = time.time()
+            connection.last_activity = time.monotonic()
+            return True
+
+        return False
+
+    def send_payload(self, connection: AX25Connection, payload: bytes) -> bool:
+        """
+        Split a payload into PACLEN-sized frames and send them in one KISS write
+
+        Direwolf queues the frames and paces them over the air, so the
+        caller never sleeps between chunks.
+
+        Args:
+            connection: Active connection
+            payload: Data to send
+
+        Returns:
+            True if successful
+        """
+        paclen = self.PACLEN
+        # Prompts and short replies fit in one frame: skip the split
+        if 0 < len(payload) <= paclen:
+            return self.send_data(connection, payload)
+
+        view = memoryview(payload)
+        chunks = [view[i:i + paclen] for i in range(0, len(view), paclen)]
+        return self.send_data_batch(connection, chunks)
+
+    def send_data_batch(self, connection: AX25Connection, chunks: List[bytes]) -> bool:
+        """
+        Send several data chunks to a connected station in one KISS write
+
+        Args:
+            connection: Active connection
+            chunks: Data chunks, one per frame
+
+        Returns:
+            True if successful
+        """
+        if connection.state != ConnectionState.CONNECTED:
+            logger.error(f"Cannot send data: {connection} not connected")
+            return False
+
+        header = connection.ui_header
+        frames = [header + chunk for chunk in chunks]
+
+        if self.kiss_client.send_frames(frames):
+            connection.packets_sent += len(frames)
+            connection.last_activity = time.monotonic()
             return True
 
         return False
@@ -338,7 +406,7 @@ class AX25ConnectionHandler:
         Args:
             timeout: Inactivity timeout in seconds
         """
-        now = time.time()
+        now = time.monotonic()
         stale = []
 
         for key, conn in self.connections.items():
@@ -6,13 +6,19 @@ Reference: http://www.ax25.net/kiss.aspx
 """
 import socket
 import logging
-from typing import Optional, Callable
+import threading
+from collections import deque
+from typing import Optional, Callable, Deque, Dict, List
 from enum import IntEnum
 
 
 logger = logging.getLogger(__name__)
 
 
+class KISSConnectionLost(RuntimeError):
+    """The TCP connection to the KISS TNC closed"""
+
+
 class KISSCommand(IntEnum):
     """KISS command codes"""
     DATA_FRAME = 0x00
@@ -25,6 +31,15 @@ class KISSCommand(IntEnum):
     RETURN = 0xFF
 
 
+# Config names for the KISS channel-access parameters the TNC applies
+KISS_PARAMETERS = {
+    'txdelay': KISSCommand.TX_DELAY,    # keyup delay, 10 ms units
+    'persist': KISSCommand.PERSISTENCE,  # p-persistence, (p * 256) - 1
+    'slottime': KISSCommand.SLOT_TIME,   # slot interval, 10 ms units
+    'txtail': KISSCommand.TX_TAIL,       # hold after frame, 10 ms units
+}
+
+
 class KISSFrame:
     """KISS frame constants"""
     FEND = 0xC0  # Frame End
@@ -33,6 +48,19 @@ class KISSFrame:
     TFESC = 0xDD  # Transposed Frame Escape
 
 
+# Socket buffer size for the KISS TCP connection (room for large batched writes)
+SOCKET_BUFFER_SIZE = 256 * 1024
+
+# Outbound frame buffer pool: buffers start at BUFFER_SIZE and grow as needed
+BUFFER_SIZE = 512
+BUFFER_POOL_SIZE = 8
+
+# Bytes read from the TNC socket per readiness event. Large enough that a
+# burst of frames (e.g. an APRS flood) is taken in one recv instead of one
+# selector wakeup per 4 KiB
+RECV_SIZE = 65536
+
+
 class KISSClient:
     """
     KISS protocol client for connecting to Direwolf or other KISS TNCs
@@ -54,6 +82,19 @@ class KISSClient:
         self.connected = False
         self.frame_callback: Optional[Callable[[bytes], None]] = None
 
+        # Receive buffer for event-driven reads (see read_available)
+        self._rx_buffer = bytearray()
+        self._rx_frames: Deque[bytes] = deque()
+        self._rx_chunk = bytearray(RECV_SIZE)
+        self._rx_view = memoryview(self._rx_chunk)
+
+        # Free-list of reusable outbound frame buffers
+        self._buf_pool: List[bytearray] = [bytearray(BUFFER_SIZE) for _ in range(BUFFER_POOL_SIZE)]
+        self._buf_lock = threading.Lock()
+
+        # Serializes socket writes so frames from different threads never interleave
+        self._tx_lock = threading.Lock()
+
     def connect(self) -> bool:
         """
         Connect to KISS TNC
@@ -65,6 +106,14 @@ class KISSClient:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.socket.settimeout(self.timeout)
             self.socket.connect((self.host, self.port))
+
+            # Frames are already batched per write, so don't let Nagle delay them
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+
+            self._rx_buffer.clear()
+            self._rx_frames.clear()
             self.connected = True
             logger.info(f"Connected to KISS TNC at {self.host}:{self.port}")
             return True
@@ -83,8 +132,19 @@ class KISSClient:
             finally:
                 self.socket = None
                 self.connected = False
+                self._rx_buffer.clear()
+                self._rx_frames.clear()
                 logger.info("Disconnected from KISS TNC")
 
+    def fileno(self) -> int:
+        """
+        Get socket file descriptor for use with selectors
+
+        Returns:
+            File descriptor, or -1 if not connected
+        """
+        return self.socket.fileno() if self.socket else -1
+
     def send_frame(self, frame: bytes, port: int = 0) -> bool:
         """
         Send a KISS frame
@@ -100,15 +160,118 @@ class KISSClient:
             logger.error("Not connected to KISS TNC")
             return False
 
+        buf = self._rent()
         try:
-            # Build KISS frame
-            kiss_frame = self._build_kiss_frame(frame, port)
-            self.socket.sendall(kiss_frame)
-            logger.debug(f"Sent KISS frame ({len(frame)} bytes)")
+            # Build KISS frame in a pooled buffer
+            length = self._pack_kiss_frame(buf, 0, frame, port)
+            with memoryview(buf) as view, self._tx_lock:
+                self.socket.sendall(view[:length])
+            logger.debug("Sent KISS frame (%d bytes)", len(frame))
             return True
         except Exception as e:
             logger.error(f"Failed to send KISS frame: {e}")
             return False
+        finally:
+            self._return(buf)
+
+    def set_parameter(self, command: KISSCommand, value: int, port: int = 0) -> bool:
+        """
+        Send a KISS parameter command (TX delay, persistence, slot time, ...)
+
+        Args:
+            command: KISS command code
+            value: Parameter value (0-255)
+            port: KISS port number (0-15)
+
+        Returns:
+            True if successful
+        """
+        if not self.connected or not self.socket:
+            logger.error("Not connected to KISS TNC")
+            return False
+
+        value &= 0xFF
+        if value == KISSFrame.FEND:
+            param = bytes((KISSFrame.FESC, KISSFrame.TFEND))
+        elif value == KISSFrame.FESC:
+            param = bytes((KISSFrame.FESC, KISSFrame.TFESC))
+        else:
+            param = bytes((value,))
+
+        try:
+            with self._tx_lock:
+                self.socket.sendall(bytes((KISSFrame.FEND, (port << 4) | command))
+                                    + param + bytes((KISSFrame.FEND,)))
+            logger.debug("Set KISS %s to %d", command.name, value)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to set KISS {command.name}: {e}")
+            return False
+
+    def configure(self, parameters: Dict[str, int], port: int = 0) -> bool:
+        """
+        Apply channel-access parameters by config name (see KISS_PARAMETERS)
+
+        Args:
+            parameters: Parameter name -> value
+            port: KISS port number (0-15)
+
+        Returns:
+            True if every parameter was sent
+        """
+        ok = True
+        for name, value in parameters.items():
+            command = KISS_PARAMETERS.get(name)
+            if command is None:
+                logger.warning(f"Unknown KISS parameter: {name}")
+                ok = False
+                continue
+            ok = self.set_parameter(command, int(value), port) and ok
+        return ok
+
+    def send_frames(self, frames: List[bytes], port: int = 0) -> bool:
+        """
+        Send several KISS frames in a single socket write
+
+        Args:
+            frames: List of AX.25 frame data
+            port: KISS port number (0-15)
+
+        Returns:
+            True if successful
+        """
+        if not self.connected or not self.socket:
+            logger.error("Not connected to KISS TNC")
+            return False
+
+        buf = self._rent()
+        try:
+            # Pack every frame back to back in a pooled buffer
+            length = 0
+            for frame in frames:
+                length = self._pack_kiss_frame(buf, length, frame, port)
+            with memoryview(buf) as view, self._tx_lock:
+                self.socket.sendall(view[:length])
+            logger.debug("Sent %d KISS frames (%d bytes)", len(frames), length)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to send KISS frames: {e}")
+            return False
+        finally:
+            self._return(buf)
+
+    def _rent(self) -> bytearray:
+        """Take a frame buffer from the pool (or allocate one if it's empty)"""
+        with self._buf_lock:
+            if self._buf_pool:
+                return self._buf_pool.pop()
+        return bytearray(BUFFER_SIZE)
+
+    def _return(self, buf: bytearray):
+        """Give a frame buffer back to the pool"""
+        with self._buf_lock:
+            if len(self._buf_pool) < BUFFER_POOL_SIZE:
+                self._buf_pool.append(buf)
 
     def receive_frame(self, timeout: Optional[float] = None) -> Optional[bytes]:
         """
@@ -124,6 +287,10 @@ class KISSClient:
             logger.error("Not connected to KISS TNC")
             return None
 
+        # Hand out frames already buffered by read_available first
+        if self._rx_frames:
+            return self._rx_frames.popleft()
+
         try:
             # Set temporary timeout if specified
             original_timeout = self.socket.gettimeout()
@@ -138,7 +305,7 @@ class KISSClient:
                 self.socket.settimeout(original_timeout)
 
             if frame:
-                logger.debug(f"Received KISS frame ({len(frame)} bytes)")
+                logger.debug("Received KISS frame (%d bytes)", len(frame))
 
             return frame
         except socket.timeout:
@@ -147,6 +314,102 @@ class KISSClient:
             logger.error(f"Failed to receive KISS frame: {e}")
             return None
 
+    def read_available(self) -> bool:
+        """
+        Read whatever data is waiting on the socket and buffer complete frames
+
+        Call this only when the socket is known to be readable (e.g. after a
+        selector reports it ready), so the single recv() does not block.
+
+        Returns:
+            False if the TNC closed the connection or a socket error occurred
+        """
+        if not self.connected or not self.socket:
+            return False
+
+        try:
+            # Read into the reusable chunk so no intermediate bytes is allocated
+            n = self.socket.recv_into(self._rx_chunk)
+        except socket.timeout:
+            return True
+        except Exception as e:
+            logger.error(f"Failed to read from KISS TNC: {e}")
+            self.connected = False
+            return False
+
+        if not n:
+            logger.error("KISS TNC closed the connection")
+            self.connected = False
+            return False
+
+        buf = self._rx_buffer
+        buf += self._rx_view[:n]
+
+        # Walk every complete FEND-delimited frame by offset, then compact once
+        fend = KISSFrame.FEND
+        start = 0
+        while True:
+            end = buf.find(fend, start + 1)
+            if end == -1:
+                break
+
+            frame = self._decode_kiss_frame(buf, start, end)
+            if frame:
+                self._rx_frames.append(frame)
+            start = end
+
+        if start:
+            del buf[:start]
+
+        return True
+
+    def receive_frame_nowait(self) -> Optional[bytes]:
+        """
+        Get the next frame buffered by read_available (non-blocking)
+
+        Returns:
+            AX.25 frame data or None if no complete frame is buffered
+        """
+        if self._rx_frames:
+            frame = self._rx_frames.popleft()
+            logger.debug("Received KISS frame (%d bytes)", len(frame))
+            return frame
+        return None
+
+    @staticmethod
+    def _decode_kiss_frame(buf: bytearray, start: int, end: int) -> Optional[bytes]:
+        """
+        Decode the contents between two FENDs into AX.25 frame data
+
+        Args:
+            buf: Receive buffer
+            start: Offset of the frame's opening FEND
+            end: Offset of the frame's closing FEND
+
+        Returns:
+            Decoded AX.25 frame or None if empty
+        """
+        fend = KISSFrame.FEND
+
+        # Data before the first FEND is the tail of a frame we joined mid-way
+        if buf[start] != fend:
+            return None
+
+        # Skip leading FENDs (back-to-back delimiters between frames)
+        while start < end and buf[start] == fend:
+            start += 1
+
+        # Drop the command byte
+        if end - start < 2:
+            return None
+        data = bytes(buf[start + 1:end])
+
+        # Undo byte stuffing
+        if KISSFrame.FESC in data:
+            data = data.replace(b'\xdb\xdc', b'\xc0').replace(b'\xdb\xdd', b'\xdb')
+
+        return data
+
     def _build_kiss_frame(self, data: bytes, port: int = 0) -> bytes:
         """
         Build a KISS frame from AX.25 data
@@ -158,25 +421,41 @@ class KISSClient:
         Returns:
             KISS-encoded frame
         """
+        frame = bytearray()
+        self._pack_kiss_frame(frame, 0, data, port)
+        return bytes(frame)
+
+    @staticmethod
+    def _pack_kiss_frame(buf: bytearray, offset: int, data: bytes, port: int = 0) -> int:
+        """
+        Write a KISS frame into a buffer, growing it if needed
+
+        Args:
+            buf: Destination buffer
+            offset: Position to write the frame at
+            data: AX.25 frame data
+            port: KISS port number
+
+        Returns:
+            Offset just past the written frame
+        """
         # Command byte: port and command
         cmd = (port << 4) | KISSCommand.DATA_FRAME
 
-        # Escape special characters
-        escaped = bytearray()
-        for byte in data:
-            if byte == KISSFrame.FEND:
-                escaped.extend([KISSFrame.FESC, KISSFrame.TFEND])
-            elif byte == KISSFrame.FESC:
-                escaped.extend([KISSFrame.FESC, KISSFrame.TFESC])
-            else:
-                escaped.append(byte)
+        # Escape special characters (FESC first so inserted escapes aren't re-escaped)
+        escaped = bytes(data).replace(b'\xdb', b'\xdb\xdd').replace(b'\xc0', b'\xdb\xdc')
 
-        # Build frame: FEND + CMD + DATA + FEND
-        frame = bytearray([KISSFrame.FEND, cmd])
-        frame.extend(escaped)
-        frame.append(KISSFrame.FEND)
+        end = offset + len(escaped) + 3
+        if end > len(buf):
+            buf.extend(bytes(end - len(buf)))
 
-        return bytes(frame)
+        # Frame: FEND + CMD + DATA + FEND
+        buf[offset] = KISSFrame.FEND
+        buf[offset + 1] = cmd
+        buf[offset + 2:end - 1] = escaped
+        buf[end - 1] = KISSFrame.FEND
+
+        return end
 
     def _read_kiss_frame(self) -> Optional[bytes]:
         """
@@ -234,44 +513,44 @@ class KISSClient:
 
         return bytes(frame_data) if frame_data else None
 
-    def set_tx_delay(self, delay: int, port: int = 0):
+    def set_tx_delay(self, delay: int, port: int = 0) -> bool:
         """
         Set TX delay (time before transmitting)
 
         Args:
             delay: Delay in 10ms units (0-255)
             port: KISS port number
+
+        Returns:
+            True if successful
         """
-        cmd = (port << 4) | KISSCommand.TX_DELAY
-        frame = bytes([KISSFrame.FEND, cmd, delay & 0xFF, KISSFrame.FEND])
-        if self.socket:
-            self.socket.sendall(frame)
+        return self.set_parameter(KISSCommand.TX_DELAY, delay, port)
 
-    def set_persistence(self, persistence: int, port: int = 0):
+    def set_persistence(self, persistence: int, port: int = 0) -> bool:
         """
         Set persistence parameter for CSMA
 
         Args:
             persistence: Persistence value (0-255)
             port: KISS port number
+
+        Returns:
+            True if successful
         """
-        cmd = (port << 4) | KISSCommand.PERSISTENCE
-        frame = bytes([KISSFrame.FEND, cmd, persistence & 0xFF, KISSFrame.FEND])
-        if self.socket:
-            self.socket.sendall(frame)
+        return self.set_parameter(KISSCommand.PERSISTENCE, persistence, port)
 
-    def set_slot_time(self, slot_time: int, port: int = 0):
+    def set_slot_time(self, slot_time: int, port: int = 0) -> bool:
         """
         Set slot time for CSMA
 
         Args:
             slot_time: Slot time in 10ms units (0-255)
             port: KISS port number
+
+        Returns:
+            True if successful
         """
-        cmd = (port << 4) | KISSCommand.SLOT_TIME
-        frame = bytes([KISSFrame.FEND, cmd, slot_time & 0xFF, KISSFrame.FEND])
-        if self.socket:
-            self.socket.sendall(frame)
+        return self.set_parameter(KISSCommand.SLOT_TIME, slot_time, port)
 
     def __enter__(self):
         """Context manager entry"""
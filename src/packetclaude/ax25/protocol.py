@@ -6,6 +6,7 @@ Reference: AX.25 v2.2 specification
 """
 import struct
 import logging
+from functools import lru_cache
 from typing import Optional, List, Tuple
 from enum import IntEnum
 
@@ -33,6 +34,20 @@ class AX25UFrameType(IntEnum):
     TEST = 0xE3  # Test
 
 
+@lru_cache(maxsize=1024)
+def _decode_callsign(field: bytes) -> str:
+    """
+    Decode the 6-byte shifted callsign field of an AX.25 address
+
+    Args:
+        field: First 6 bytes of an encoded address
+
+    Returns:
+        Callsign with padding stripped
+    """
+    return ''.join(chr(b >> 1) for b in field).strip()
+
+
 class AX25Address:
     """AX.25 address (callsign + SSID)"""
 
@@ -91,8 +106,8 @@ class AX25Address:
         if len(data) < 7:
             raise ValueError("Address must be 7 bytes")
 
-        # Decode callsign (shift right 1 bit)
-        callsign = ''.join(chr(b >> 1) for b in data[:6]).strip()
+        # Decode callsign (shift right 1 bit); the same few stations repeat
+        callsign = _decode_callsign(bytes(data[:6]))
 
         # Decode SSID byte
         ssid_byte = data[6]
@@ -102,13 +117,13 @@ class AX25Address:
 
         return AX25Address(callsign, ssid, command_response, reserved_bits)
 
-    def __str__(self):
+    def __str__(self) -> str:
         """String representation"""
         if self.ssid:
             return f"{self.callsign.strip()}-{self.ssid}"
         return self.callsign.strip()
 
-    def __repr__(self):
+    def __repr__(self) -> str:
         return f"AX25Address('{self}')"
 
 
@@ -118,7 +133,7 @@ class AX25Frame:
     def __init__(self,
                  destination: AX25Address,
                  source: AX25Address,
-                 digipeaters: List[AX25Address] = None,
+                 digipeaters: Optional[List[AX25Address]] = None,
                  control: int = 0x03,
                  pid: int = 0xF0,
                  info: bytes = b''):
@@ -199,7 +214,7 @@ class AX25Frame:
         offset += 7
 
         # Decode digipeaters
-        digipeaters = []
+        digipeaters: List[AX25Address] = []
         while offset < len(data) and not (data[offset - 1] & 0x01):
             if offset + 7 > len(data):
                 break
@@ -260,6 +275,29 @@ class AX25Frame:
         """Check if this is a DM (Disconnect Mode) frame"""
         return (self.control & 0xEF) == 0x0F
 
+    @staticmethod
+    def encode_ui_header(destination: str, source: str,
+                         dest_ssid: int = 0,
+                         source_ssid: int = 0) -> bytes:
+        """
+        Encode the fixed part of a UI frame (addresses, control, PID)
+
+        Prepending this to an info payload gives the same bytes as
+        create_ui_frame(...).encode(), without rebuilding the addresses.
+
+        Args:
+            destination: Destination callsign
+            source: Source callsign
+            dest_ssid: Destination SSID
+            source_ssid: Source SSID
+
+        Returns:
+            Encoded header bytes
+        """
+        return (AX25Address(destination, dest_ssid).encode(last=False) +
+                AX25Address(source, source_ssid).encode(last=True) +
+                bytes((0x03, 0xF0)))  # UI frame, no layer 3
+
     @staticmethod
     def create_ui_frame(destination: str, source: str,
                        info: bytes,
@@ -382,7 +420,7 @@ class AX25Frame:
             info=b''
         )
 
-    def __str__(self):
+    def __str__(self) -> str:
         """String representation"""
         frame_type = "UNKNOWN"
         if self.is_ui_frame():
@@ -398,10 +436,11 @@ class AX25Frame:
 
         return f"{self.source} -> {self.destination} [{frame_type}]"
 
-    def __repr__(self):
+    def __repr__(self) -> str:
         return f"AX25Frame({self})"
 
 
+@lru_cache(maxsize=1024)
 def parse_callsign(callsign_str: str) -> Tuple[str, int]:
     """
     Parse callsign string into callsign and SSID
@@ -412,13 +451,12 @@ def parse_callsign(callsign_str: str) -> Tuple[str, int]:
     Returns:
         Tuple of (callsign, ssid)
     """
-    if '-' in callsign_str:
-        parts = callsign_str.split('-')
-        callsign = parts[0].strip().upper()
-        try:
-            ssid = int(parts[1])
-        except ValueError:
-            ssid = 0
-        return callsign, ssid
-    else:
-        return callsign_str.strip().upper(), 0
+    callsign, sep, ssid_str = callsign_str.partition('-')
+    callsign = callsign.strip().upper()
+    if not sep:
+        return callsign, 0
+    try:
+        ssid = int(ssid_str)
+    except ValueError:
+        ssid = 0
+    return callsign, ssid
@@ -126,7 +126,7 @@ class YAPPTransfer:
         self.expected_blocks = 0
 
         # Timing and retries
-        self.last_activity = time.time()
+        self.last_activity = time.monotonic()
         self.retry_count = 0
 
         # Callbacks
@@ -143,7 +143,7 @@ class YAPPTransfer:
         """
         logger.info(f"Starting YAPP upload from {self.callsign}")
         self.state = YAPPState.WAIT_ACK
-        self.last_activity = time.time()
+        self.last_activity = time.monotonic()
         # Send ACK to indicate ready to receive
         return bytes([YAPPControl.ACK])
 
@@ -171,7 +171,7 @@ class YAPPTransfer:
         self.current_block = 0
 
         self.state = YAPPState.WAIT_ACK
-        self.last_activity = time.time()
+        self.last_activity = time.monotonic()
 
         # Send ENQ to request permission to send
         return bytes([YAPPControl.ENQ])
@@ -186,7 +186,7 @@ class YAPPTransfer:
         Returns:
             Response packet to send, or None
         """
-        self.last_activity = time.time()
+        self.last_activity = time.monotonic()
 
         if not data:
             return None
@@ -240,8 +240,8 @@ class YAPPTransfer:
 
                     # Check if we're done
                     if len(self.file_data) >= self.header.file_size:
-                        # Truncate to exact size
-                        self.file_data = self.file_data[:self.header.file_size]
+                        # Truncate to exact size (in place, no copy)
+                        del self.file_data[self.header.file_size:]
                         logger.info(f"File transfer complete: {len(self.file_data)} bytes")
                         self.state = YAPPState.COMPLETE
 
@@ -316,7 +316,7 @@ class YAPPTransfer:
             block_data = block_data + b'\x00' * (self.BLOCK_SIZE - len(block_data))
 
         packet = bytes([YAPPControl.STX]) + block_data
-        logger.debug(f"Sending block {self.current_block + 1}/{self.expected_blocks}")
+        logger.debug("Sending block %d/%d", self.current_block + 1, self.expected_blocks)
         return packet
 
     def _handle_nak(self) -> bytes:
@@ -350,7 +350,7 @@ class YAPPTransfer:
 
     def is_timeout(self) -> bool:
         """Check if transfer has timed out"""
-        return (time.time() - self.last_activity) > self.TIMEOUT
+        return (time.monotonic() - self.last_activity) > self.TIMEOUT
 
     def cancel(self) -> bytes:
         """Cancel the transfer"""
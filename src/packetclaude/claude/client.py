@@ -5,7 +5,7 @@ Handles communication with Anthropic's Claude API
 import logging
 import time
 import json
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Sequence
 from anthropic import Anthropic, APIError, APIConnectionError
 
 
@@ -44,7 +44,7 @@ class ClaudeClient:
 
     def send_message(self,
                     message: str,
-                    conversation_history: List[Dict[str, str]] = None) -> tuple[Optional[str], Optional[int], Optional[str]]:
+                    conversation_history: Sequence[Dict[str, str]] = None) -> tuple[Optional[str], Optional[int], Optional[str]]:
         """
         Send a message to Claude
 
@@ -55,7 +55,7 @@ class ClaudeClient:
         Returns:
             Tuple of (response_text, tokens_used, error_message)
         """
-        start_time = time.time()
+        start_time = time.monotonic()
 
         try:
             # Build messages list
@@ -157,7 +157,7 @@ class ClaudeClient:
             if hasattr(response, 'usage'):
                 total_tokens += response.usage.input_tokens + response.usage.output_tokens
 
-            elapsed_ms = int((time.time() - start_time) * 1000)
+            elapsed_ms = int((time.monotonic() - start_time) * 1000)
             logger.info(f"Claude response received ({elapsed_ms}ms, {total_tokens} tokens, {iteration} tool iterations)")
 
             return response_text, total_tokens, None
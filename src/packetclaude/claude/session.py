@@ -2,8 +2,10 @@
 Session management for per-callsign Claude conversations
 """
 import logging
+import sys
+import threading
 import time
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from collections import deque
 
 
@@ -26,8 +28,11 @@ class ConversationSession:
         self.callsign = callsign
         self.max_messages = max_messages
         self.messages: deque = deque(maxlen=max_messages)
+        # Wall-clock times for display; the monotonic pair drives age/idle
         self.created_at = time.time()
-        self.last_activity = time.time()
+        self.last_activity = self.created_at
+        self._created_mono = time.monotonic()
+        self._activity_mono = self._created_mono
         self.query_count = 0
         self.authenticated = False
         self.operator_info: Optional[Dict] = None
@@ -50,17 +55,18 @@ class ConversationSession:
             "content": content
         })
         self.last_activity = time.time()
+        self._activity_mono = time.monotonic()
         if role == "user":
             self.query_count += 1
 
-    def get_history(self) -> List[Dict[str, str]]:
+    def get_history(self) -> Tuple[Dict[str, str], ...]:
         """
         Get conversation history
 
         Returns:
-            List of messages
+            Immutable snapshot of the messages
         """
-        return list(self.messages)
+        return tuple(self.messages)
 
     def clear(self):
         """Clear conversation history"""
@@ -85,7 +91,7 @@ class ConversationSession:
         Returns:
             Age in seconds
         """
-        return time.time() - self.created_at
+        return time.monotonic() - self._created_mono
 
     def get_idle_time(self) -> float:
         """
@@ -94,7 +100,7 @@ class ConversationSession:
         Returns:
             Idle time in seconds
         """
-        return time.time() - self.last_activity
+        return time.monotonic() - self._activity_mono
 
     def __str__(self):
         return f"{self.callsign} ({len(self.messages)} messages, {self.query_count} queries)"
@@ -114,6 +120,13 @@ class SessionManager:
         """
         self.max_messages = max_messages_per_session
         self.sessions: Dict[str, ConversationSession] = {}
+        # Secondary names for existing sessions (e.g. a telnet callsign for the
+        # IP:port key it connected as), so renames never move dict entries
+        self.aliases: Dict[str, str] = {}
+        # Re-entrant: turn_begin/turn_commit call get_session while holding it.
+        # Guards the session dict against the receive loop, telnet threads,
+        # Claude workers and the cleanup thread touching it concurrently.
+        self._lock = threading.RLock()
 
     def get_session(self, callsign: str) -> ConversationSession:
         """
@@ -126,15 +139,49 @@ class SessionManager:
             ConversationSession
         """
         callsign_upper = callsign.upper()
+        callsign_upper = self.aliases.get(callsign_upper, callsign_upper)
+
+        session = self.sessions.get(callsign_upper)
+        if session is not None:
+            return session
+
+        with self._lock:
+            session = self.sessions.get(callsign_upper)
+            if session is None:
+                callsign_upper = sys.intern(callsign_upper)
+                logger.info(f"Creating new session for {callsign_upper}")
+                session = ConversationSession(callsign_upper, self.max_messages)
+                self.sessions[callsign_upper] = session
+            return session
+
+    def add_alias(self, alias: str, callsign: str):
+        """
+        Make an alternate name resolve to an existing session key
+
+        Args:
+            alias: New name for the session
+            callsign: Key the session is stored under
+        """
+        alias_upper = alias.upper()
+        callsign_upper = callsign.upper()
+        if alias_upper == callsign_upper:
+            return
 
-        if callsign_upper not in self.sessions:
-            logger.info(f"Creating new session for {callsign_upper}")
-            self.sessions[callsign_upper] = ConversationSession(
-                callsign_upper,
-                self.max_messages
-            )
+        with self._lock:
+            self.aliases[alias_upper] = self.aliases.get(callsign_upper, callsign_upper)
+
+    def _drop_aliases(self, removed: List[str]):
+        """
+        Forget aliases pointing at removed sessions (caller holds the lock)
 
-        return self.sessions[callsign_upper]
+        Args:
+            removed: Session keys that were removed
+        """
+        if not self.aliases:
+            return
+        removed_set = set(removed)
+        for alias in [a for a, key in self.aliases.items() if key in removed_set]:
+            del self.aliases[alias]
 
     def add_user_message(self, callsign: str, message: str):
         """
@@ -158,7 +205,34 @@ class SessionManager:
         session = self.get_session(callsign)
         session.add_message("assistant", message)
 
-    def get_history(self, callsign: str) -> List[Dict[str, str]]:
+    def turn_begin(self, callsign: str) -> Tuple[Dict[str, str], ...]:
+        """
+        Start a conversation turn by snapshotting the history
+
+        Args:
+            callsign: User callsign
+
+        Returns:
+            Snapshot of the conversation history before this turn
+        """
+        with self._lock:
+            return self.get_session(callsign).get_history()
+
+    def turn_commit(self, callsign: str, user_message: str, assistant_message: str):
+        """
+        Finish a conversation turn by recording both sides of the exchange
+
+        Args:
+            callsign: User callsign
+            user_message: User message
+            assistant_message: Assistant response
+        """
+        with self._lock:
+            session = self.get_session(callsign)
+            session.add_message("user", user_message)
+            session.add_message("assistant", assistant_message)
+
+    def get_history(self, callsign: str) -> Tuple[Dict[str, str], ...]:
         """
         Get conversation history for callsign
 
@@ -166,10 +240,10 @@ class SessionManager:
             callsign: User callsign
 
         Returns:
-            List of messages
+            Immutable snapshot of the messages
         """
-        session = self.get_session(callsign)
-        return session.get_history()
+        with self._lock:
+            return self.get_session(callsign).get_history()
 
     def clear_session(self, callsign: str):
         """
@@ -179,8 +253,10 @@ class SessionManager:
             callsign: User callsign
         """
         callsign_upper = callsign.upper()
-        if callsign_upper in self.sessions:
-            self.sessions[callsign_upper].clear()
+        with self._lock:
+            session = self.sessions.get(self.aliases.get(callsign_upper, callsign_upper))
+            if session is not None:
+                session.clear()
 
     def remove_session(self, callsign: str):
         """
@@ -190,8 +266,11 @@ class SessionManager:
             callsign: User callsign
         """
         callsign_upper = callsign.upper()
-        if callsign_upper in self.sessions:
-            del self.sessions[callsign_upper]
+        with self._lock:
+            key = self.aliases.pop(callsign_upper, callsign_upper)
+            removed = self.sessions.pop(key, None)
+            self._drop_aliases([key])
+        if removed is not None:
             logger.info(f"Removed session for {callsign_upper}")
 
     def cleanup_idle_sessions(self, timeout: int = 300):
@@ -201,15 +280,17 @@ class SessionManager:
         Args:
             timeout: Idle timeout in seconds
         """
-        to_remove = []
-
-        for callsign, session in self.sessions.items():
-            if session.get_idle_time() > timeout:
-                to_remove.append(callsign)
+        with self._lock:
+            to_remove = [
+                callsign for callsign, session in self.sessions.items()
+                if session.get_idle_time() > timeout
+            ]
+            for callsign in to_remove:
+                del self.sessions[callsign]
+            self._drop_aliases(to_remove)
 
         for callsign in to_remove:
             logger.info(f"Removing idle session: {callsign}")
-            del self.sessions[callsign]
 
     def get_active_sessions(self) -> List[ConversationSession]:
         """
@@ -218,7 +299,8 @@ class SessionManager:
         Returns:
             List of sessions
         """
-        return list(self.sessions.values())
+        with self._lock:
+            return list(self.sessions.values())
 
     def get_session_count(self) -> int:
         """
@@ -236,11 +318,12 @@ class SessionManager:
         Returns:
             Dictionary with statistics
         """
-        total_messages = sum(len(s.messages) for s in self.sessions.values())
-        total_queries = sum(s.query_count for s in self.sessions.values())
+        sessions = self.get_active_sessions()
+        total_messages = sum(len(s.messages) for s in sessions)
+        total_queries = sum(s.query_count for s in sessions)
 
         return {
-            'active_sessions': len(self.sessions),
+            'active_sessions': len(sessions),
             'total_messages': total_messages,
             'total_queries': total_queries,
         }
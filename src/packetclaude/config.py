@@ -99,6 +99,11 @@ class Config:
         """Get Direwolf connection timeout"""
         return self.get('direwolf.timeout', 30)
 
+    @property
+    def direwolf_kiss_parameters(self) -> dict:
+        """Get KISS channel-access parameters to send to the TNC (empty = TNC defaults)"""
+        return self.get('direwolf.kiss', None) or {}
+
     @property
     def telnet_enabled(self) -> bool:
         """Check if telnet server is enabled"""
@@ -134,6 +139,11 @@ class Config:
         """Get radio baud rate"""
         return self.get('radio.baud', 4800)
 
+    @property
+    def radio_ptt_hang_ms(self) -> int:
+        """Get how long PTT stays keyed after a release, in milliseconds (0 = off)"""
+        return self.get('radio.ptt_hang_ms', 0)
+
     @property
     def claude_model(self) -> str:
         """Get Claude model name"""
@@ -149,6 +159,11 @@ class Config:
         """Get Claude temperature"""
         return self.get('claude.temperature', 0.7)
 
+    @property
+    def max_concurrent_queries(self) -> int:
+        """Get maximum number of Claude queries run concurrently"""
+        return self.get('claude.max_concurrent_queries', 8)
+
     @property
     def claude_system_prompt(self) -> str:
         """Get Claude system prompt from file"""
@@ -334,6 +349,16 @@ class Config:
         """Get YAPP transfer timeout in seconds"""
         return self.get('file_transfer.yapp_timeout_seconds', 30)
 
+    @property
+    def main_cpus(self) -> list:
+        """Get CPU cores to pin the main receive thread to (empty = no pinning)"""
+        return self.get('performance.main_cpus', []) or []
+
+    @property
+    def worker_cpus(self) -> list:
+        """Get CPU cores to pin Claude worker threads to (empty = no pinning)"""
+        return self.get('performance.worker_cpus', []) or []
+
     def reload(self):
         """Reload configuration from file"""
         self._load_config()
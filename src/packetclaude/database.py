@@ -4,31 +4,101 @@ Handles activity logging and rate limiting tracking
 """
 import sqlite3
 import json
+import logging
+import queue
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from contextlib import contextmanager
 
 
+logger = logging.getLogger(__name__)
+
+
+# Try to import zstandard for file compression, but don't fail if not available
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+# Number of pooled SQLite connections
+POOL_SIZE = 5
+
+# Seconds to wait for a free pooled connection before giving up
+CHECKOUT_TIMEOUT = 30.0
+
+# zstd compression level for stored file data
+ZSTD_LEVEL = 3
+
+# MIME type prefixes that are already compressed and not worth recompressing
+INCOMPRESSIBLE_MIME_PREFIXES = ('image/', 'audio/', 'video/')
+INCOMPRESSIBLE_MIME_TYPES = frozenset({
+    'application/zip',
+    'application/gzip',
+    'application/x-gzip',
+    'application/x-bzip2',
+    'application/x-xz',
+    'application/x-7z-compressed',
+    'application/x-rar-compressed',
+    'application/zstd',
+    'application/pdf',
+})
+
+
 class Database:
     """SQLite database manager for PacketClaude"""
 
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path, pool_size: int = POOL_SIZE):
         """
         Initialize database
 
         Args:
             db_path: Path to SQLite database file
+            pool_size: Number of connections to keep open
         """
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Pool of open connections, shared across threads
+        self._pool_size = pool_size
+        self._closed = False
+        self._pool: queue.Queue = queue.Queue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._pool.put(self._open_connection())
+
         self._init_schema()
 
-    @contextmanager
-    def _get_connection(self):
-        """Get database connection context manager"""
-        conn = sqlite3.connect(str(self.db_path))
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open and configure a pooled connection"""
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
         conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    @contextmanager
+    def checkout(self):
+        """
+        Check a connection out of the pool for one transaction
+
+        Commits on success, rolls back on error, and returns the
+        connection to the pool either way.
+
+        Raises:
+            sqlite3.ProgrammingError: If the database has been closed or
+                no connection frees up within CHECKOUT_TIMEOUT
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError("Database is closed")
+        try:
+            conn = self._pool.get(timeout=CHECKOUT_TIMEOUT)
+        except queue.Empty:
+            raise sqlite3.ProgrammingError(
+                "Timed out waiting for a database connection"
+            )
         try:
             yield conn
             conn.commit()
@@ -36,7 +106,40 @@ class Database:
             conn.rollback()
             raise
         finally:
-            conn.close()
+            if self._closed:
+                # close() gave up waiting on this one; close it here
+                conn.close()
+            else:
+                self._pool.put(conn)
+
+    def close(self, timeout: float = 5.0):
+        """
+        Checkpoint the WAL and close every pooled connection
+
+        Args:
+            timeout: How long to wait for each checked-out connection
+        """
+        # Refuse new checkouts; connections still out are closed on return
+        self._closed = True
+        checkpointed = False
+        for _ in range(self._pool_size):
+            try:
+                conn = self._pool.get(timeout=timeout)
+            except queue.Empty:
+                logger.warning("Database connection still in use at close")
+                continue
+            try:
+                if not checkpointed:
+                    # Fold the WAL back into the main file before exit
+                    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                    checkpointed = True
+                conn.close()
+            except sqlite3.Error as e:
+                logger.error(f"Error closing database connection: {e}")
+
+    def _get_connection(self):
+        """Get database connection context manager"""
+        return self.checkout()
 
     def _init_schema(self):
         """Initialize database schema"""
@@ -129,10 +232,19 @@ class Database:
                     access_level TEXT NOT NULL DEFAULT 'private',
                     description TEXT,
                     uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    download_count INTEGER DEFAULT 0
+                    download_count INTEGER DEFAULT 0,
+                    compressed INTEGER DEFAULT 0
                 )
             """)
 
+            # Migrate files tables created before file_data compression
+            cursor.execute("PRAGMA table_info(files)")
+            file_columns = {row['name'] for row in cursor.fetchall()}
+            if 'compressed' not in file_columns:
+                cursor.execute("""
+                    ALTER TABLE files ADD COLUMN compressed INTEGER DEFAULT 0
+                """)
+
             # File shares table (for callsign-specific sharing)
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS file_shares (
@@ -294,29 +406,44 @@ class Database:
             packets_sent: Number of packets sent
             packets_received: Number of packets received
         """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
+        self.log_disconnections([{
+            'connection_id': connection_id,
+            'packets_sent': packets_sent,
+            'packets_received': packets_received,
+        }])
 
-            # Get connection start time
-            cursor.execute("""
-                SELECT connected_at FROM connections WHERE id = ?
-            """, (connection_id,))
-            row = cursor.fetchone()
+    def log_disconnections(self, disconnections: List[Dict[str, Any]]):
+        """
+        Log several disconnections in a single transaction
 
-            if row:
-                connected_at = datetime.fromisoformat(row['connected_at'])
-                disconnected_at = datetime.utcnow()
-                duration = int((disconnected_at - connected_at).total_seconds())
+        Args:
+            disconnections: Dicts with connection_id and optional packets_sent,
+                packets_received and disconnected_at (defaults to now)
+        """
+        if not disconnections:
+            return
 
-                cursor.execute("""
-                    UPDATE connections
-                    SET disconnected_at = ?,
-                        duration_seconds = ?,
-                        packets_sent = ?,
-                        packets_received = ?
-                    WHERE id = ?
-                """, (disconnected_at, duration, packets_sent,
-                      packets_received, connection_id))
+        now = datetime.utcnow()
+        rows = [
+            (d.get('disconnected_at') or now,) * 2 + (
+                d.get('packets_sent', 0),
+                d.get('packets_received', 0),
+                d['connection_id']
+            )
+            for d in disconnections
+        ]
+
+        with self._get_connection() as conn:
+            # Duration is computed in SQL so no per-row SELECT is needed
+            conn.executemany("""
+                UPDATE connections
+                SET disconnected_at = ?,
+                    duration_seconds = CAST(
+                        (julianday(?) - julianday(connected_at)) * 86400 AS INTEGER),
+                    packets_sent = ?,
+                    packets_received = ?
+                WHERE id = ?
+            """, rows)
 
     # Query logging methods
 
@@ -352,52 +479,33 @@ class Database:
                   response_time_ms, error))
             return cursor.lastrowid
 
-    # Rate limiting methods
-
-    def check_rate_limit(self, callsign: str,
-                        queries_per_hour: int,
-                        queries_per_day: int) -> tuple[bool, Optional[str]]:
+    def log_queries(self, queries: List[Dict[str, Any]]):
         """
-        Check if callsign is within rate limits
+        Log several queries in a single transaction
 
         Args:
-            callsign: Station callsign
-            queries_per_hour: Maximum queries per hour
-            queries_per_day: Maximum queries per day
-
-        Returns:
-            Tuple of (allowed: bool, reason: str if not allowed)
+            queries: List of dicts with the same keys as log_query's arguments,
+                plus an optional timestamp (defaults to now)
         """
-        now = datetime.utcnow()
-        hour_ago = now - timedelta(hours=1)
-        day_ago = now - timedelta(days=1)
+        if not queries:
+            return
 
+        now = datetime.utcnow()
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-
-            # Check hourly limit
-            cursor.execute("""
-                SELECT COUNT(*) as count
-                FROM queries
-                WHERE callsign = ? AND timestamp > ? AND error IS NULL
-            """, (callsign, hour_ago))
-            hourly_count = cursor.fetchone()['count']
-
-            if hourly_count >= queries_per_hour:
-                return False, f"Hourly limit reached ({queries_per_hour}/hour)"
-
-            # Check daily limit
-            cursor.execute("""
-                SELECT COUNT(*) as count
-                FROM queries
-                WHERE callsign = ? AND timestamp > ? AND error IS NULL
-            """, (callsign, day_ago))
-            daily_count = cursor.fetchone()['count']
-
-            if daily_count >= queries_per_day:
-                return False, f"Daily limit reached ({queries_per_day}/day)"
+            conn.executemany("""
+                INSERT INTO queries
+                (connection_id, callsign, query, response, tokens_used,
+                 response_time_ms, error, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (q.get('connection_id'), q['callsign'], q['query'],
+                 q.get('response'), q.get('tokens_used'),
+                 q.get('response_time_ms'), q.get('error'),
+                 q.get('timestamp') or now)
+                for q in queries
+            ])
 
-            return True, None
+    # Rate limiting methods
 
     def get_rate_limit_status(self, callsign: str,
                              queries_per_hour: int,
@@ -815,6 +923,53 @@ class Database:
 
     # File management methods
 
+    @staticmethod
+    def _compress_file_data(file_data: bytes, mime_type: str) -> Tuple[bytes, bool]:
+        """
+        Compress file data with zstd for storage
+
+        Args:
+            file_data: File contents as bytes
+            mime_type: MIME type of the file
+
+        Returns:
+            Tuple of (stored_data, compressed)
+        """
+        if not ZSTD_AVAILABLE or not file_data:
+            return file_data, False
+
+        mime_type = mime_type or ''
+        if mime_type.startswith(INCOMPRESSIBLE_MIME_PREFIXES) or mime_type in INCOMPRESSIBLE_MIME_TYPES:
+            return file_data, False
+
+        compressed = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(file_data)
+
+        # Only keep the compressed form if it actually saves space
+        if len(compressed) >= len(file_data):
+            return file_data, False
+
+        return compressed, True
+
+    @staticmethod
+    def _decompress_file_data(stored_data: bytes, compressed: bool) -> bytes:
+        """
+        Restore file data read from storage
+
+        Args:
+            stored_data: Data as stored in the file_data column
+            compressed: Whether the stored data is zstd-compressed
+
+        Returns:
+            Original file contents
+        """
+        if not compressed:
+            return stored_data
+
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("File is zstd-compressed but zstandard is not installed")
+
+        return zstandard.ZstdDecompressor().decompress(stored_data)
+
     def save_file(self, filename: str, file_data: bytes, file_size: int,
                   mime_type: str, checksum: str, owner_callsign: str,
                   access_level: str = 'private', description: str = None) -> int:
@@ -834,14 +989,18 @@ class Database:
         Returns:
             File ID
         """
+        stored_data, compressed = self._compress_file_data(file_data, mime_type)
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO files (filename, file_data, file_size, mime_type,
-                                 checksum, owner_callsign, access_level, description)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (filename, file_data, file_size, mime_type, checksum,
-                  owner_callsign.upper(), access_level, description))
+                                 checksum, owner_callsign, access_level, description,
+                                 compressed)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (filename, stored_data, file_size, mime_type, checksum,
+                  owner_callsign.upper(), access_level, description,
+                  1 if compressed else 0))
             return cursor.lastrowid
 
     def get_file(self, file_id: int) -> Optional[Dict]:
@@ -859,7 +1018,7 @@ class Database:
             cursor.execute("""
                 SELECT id, filename, file_data, file_size, mime_type,
                        checksum, owner_callsign, access_level, description,
-                       uploaded_at, download_count
+                       uploaded_at, download_count, compressed
                 FROM files
                 WHERE id = ?
             """, (file_id,))
@@ -869,7 +1028,7 @@ class Database:
             return {
                 'id': row['id'],
                 'filename': row['filename'],
-                'file_data': row['file_data'],
+                'file_data': self._decompress_file_data(row['file_data'], row['compressed']),
                 'file_size': row['file_size'],
                 'mime_type': row['mime_type'],
                 'checksum': row['checksum'],
@@ -902,6 +1061,7 @@ class Database:
                      'uploaded_at', 'download_count']
             if include_data:
                 fields.insert(2, 'file_data')
+                fields.append('compressed')
 
             query = f"SELECT {', '.join(fields)} FROM files WHERE 1=1"
             params = []
@@ -946,7 +1106,9 @@ class Database:
                     'download_count': row['download_count']
                 }
                 if include_data:
-                    file_dict['file_data'] = row['file_data']
+                    file_dict['file_data'] = self._decompress_file_data(
+                        row['file_data'], row['compressed']
+                    )
                 files.append(file_dict)
 
             return files
@@ -4,9 +4,9 @@ Handles file upload, download, storage, and access control
 """
 import hashlib
 import logging
-import mimetypes
 import os
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, List, Dict, Tuple
 from ..database import Database
@@ -14,6 +14,50 @@ from ..database import Database
 
 logger = logging.getLogger(__name__)
 
+_LIST_HEADER = ("ID  | Filename                     | Size    | Owner      | Access\n"
+                "----|------------------------------|---------|------------|--------")
+
+
+@lru_cache(maxsize=4096)
+def _format_size(size_bytes: int) -> str:
+    """Format a byte count; cached since listings repeat the same sizes"""
+    if size_bytes < 1024:
+        return f"{size_bytes} B"
+    elif size_bytes < 1024 * 1024:
+        return f"{size_bytes / 1024:.1f} KB"
+    else:
+        return f"{size_bytes / (1024 * 1024):.1f} MB"
+
+
+@lru_cache(maxsize=256)
+def _format_list(rows: Tuple[Tuple, ...], show_owner: bool) -> str:
+    """
+    Render a file listing from its display fields
+
+    Args:
+        rows: Tuples of (id, filename, file_size, owner_callsign, access_level)
+        show_owner: Include owner in display
+
+    Returns:
+        Formatted string
+    """
+    lines = [_LIST_HEADER]
+
+    for file_id, filename, file_size, owner_callsign, access_level in rows:
+        filename = filename[:28].ljust(28)
+        size_str = _format_size(file_size).rjust(7)
+        access = access_level[:7]
+
+        if show_owner:
+            owner = owner_callsign[:10].ljust(10)
+            line = f"{file_id:<4}| {filename} | {size_str} | {owner} | {access}"
+        else:
+            line = f"{file_id:<4}| {filename} | {size_str} | {access}"
+
+        lines.append(line)
+
+    return '\n'.join(lines)
+
 
 class FileManager:
     """
@@ -25,6 +69,9 @@ class FileManager:
     MAX_FILES_PER_USER = 50  # Maximum files per user
     MAX_TOTAL_SIZE_PER_USER = 5 * 1024 * 1024  # 5 MB total per user
 
+    # Valid access levels
+    ACCESS_LEVELS = frozenset({'private', 'public', 'shared'})
+
     # Allowed filename characters
     FILENAME_PATTERN = re.compile(r'^[a-zA-Z0-9._-]+$')
 
@@ -38,6 +85,9 @@ class FileManager:
         """
         self.database = database
 
+        # mimetypes is imported on first use (see guess_mime_type)
+        self._mimetypes = None
+
         if max_file_size:
             self.MAX_FILE_SIZE = max_file_size
 
@@ -115,7 +165,12 @@ class FileManager:
         Returns:
             MIME type string
         """
-        mime_type, _ = mimetypes.guess_type(filename)
+        if self._mimetypes is None:
+            # Deferred import - loading the MIME type database is slow
+            import mimetypes
+            self._mimetypes = mimetypes
+
+        mime_type, _ = self._mimetypes.guess_type(filename)
         return mime_type or 'application/octet-stream'
 
     def check_quota(self, callsign: str, file_size: int) -> Tuple[bool, Optional[str]]:
@@ -182,7 +237,7 @@ class FileManager:
         mime_type = self.guess_mime_type(filename)
 
         # Validate access level
-        if access_level not in ['private', 'public', 'shared']:
+        if access_level not in self.ACCESS_LEVELS:
             access_level = 'private'
 
         try:
@@ -378,12 +433,7 @@ class FileManager:
         Returns:
             Formatted string (e.g., "1.5 KB")
         """
-        if size_bytes < 1024:
-            return f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            return f"{size_bytes / 1024:.1f} KB"
-        else:
-            return f"{size_bytes / (1024 * 1024):.1f} MB"
+        return _format_size(size_bytes)
 
     def format_file_list(self, files: List[Dict], show_owner: bool = True) -> str:
         """
@@ -399,21 +449,10 @@ class FileManager:
         if not files:
             return "No files found."
 
-        lines = []
-        lines.append("ID  | Filename                     | Size    | Owner      | Access")
-        lines.append("----|------------------------------|---------|------------|--------")
-
-        for f in files:
-            filename = f['filename'][:28].ljust(28)
-            size_str = self.format_file_size(f['file_size']).rjust(7)
-            owner = f['owner_callsign'][:10].ljust(10) if show_owner else ""
-            access = f['access_level'][:7]
-
-            if show_owner:
-                line = f"{f['id']:<4}| {filename} | {size_str} | {owner} | {access}"
-            else:
-                line = f"{f['id']:<4}| {filename} | {size_str} | {access}"
-
-            lines.append(line)
-
-        return '\n'.join(lines)
+        # Render from a hashable signature of the displayed fields so an
+        # unchanged listing is served from the cache
+        rows = tuple(
+            (f['id'], f['filename'], f['file_size'], f['owner_callsign'], f['access_level'])
+            for f in files
+        )
+        return _format_list(rows, show_owner)
@@ -9,6 +9,15 @@ from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
+# Use orjson for structured log records if available (much faster than json)
+try:
+    import orjson
+
+    def _dumps(data: dict) -> str:
+        return orjson.dumps(data).decode('utf-8')
+except ImportError:
+    _dumps = json.dumps
+
 
 def setup_logging(log_dir: Path,
                  log_level: str = "INFO",
@@ -91,13 +100,14 @@ class JsonFormatter(logging.Formatter):
         if record.exc_info:
             log_data['exception'] = self.formatException(record.exc_info)
 
-        # Add extra fields
-        if hasattr(record, 'callsign'):
-            log_data['callsign'] = record.callsign
-        if hasattr(record, 'connection_id'):
-            log_data['connection_id'] = record.connection_id
+        # Add extra fields (membership test, not hasattr's AttributeError trap)
+        extra = record.__dict__
+        if 'callsign' in extra:
+            log_data['callsign'] = extra['callsign']
+        if 'connection_id' in extra:
+            log_data['connection_id'] = extra['connection_id']
 
-        return json.dumps(log_data)
+        return _dumps(log_data)
 
 
 class ActivityLogger:
@@ -212,4 +222,4 @@ class ActivityLogger:
 
     def log_stats(self, stats: dict):
         """Log statistics"""
-        self.logger.info(f"Statistics: {json.dumps(stats)}")
+        self.logger.info(f"Statistics: {_dumps(stats)}")
@@ -2,43 +2,207 @@
 PacketClaude - Main application
 AX.25 Packet Radio Gateway for Claude AI
 """
+import codecs
+import functools
+import itertools
+import os
 import signal
+import queue
+import selectors
+import socket
 import sys
 import time
 import logging
 import threading
-from pathlib import Path
-from typing import Optional
+from collections import deque
+from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
 
 from .config import Config
 from .database import Database
-from .ax25.kiss import KISSClient
-from .ax25.protocol import AX25Frame
+from .ax25.kiss import KISSClient, KISSConnectionLost
+from .ax25.protocol import AX25Frame, parse_callsign
 from .ax25.connection import AX25ConnectionHandler, AX25Connection
 from .telnet.server import TelnetServer, TelnetConnection
 from .radio.hamlib_control import RadioControl, DummyRadioControl
-from .claude.client import ClaudeClient
 from .claude.session import SessionManager
-from .auth.rate_limiter import RateLimiter
+from .auth.rate_limiter import RateLimiter, CALLSIGN_RE
 from .logging.activity_logger import setup_logging, ActivityLogger
-from .tools.web_search import WebSearchTool
-from .tools.pota_spots import POTASpotsTool
-from .tools.bbs_session import BBSSessionTool
-from .tools.qrz_tool import QRZTool
-from .tools.message_tool import MessageTool
-from .tools.band_conditions import BandConditionsTool
-from .tools.dx_cluster import DXClusterTool
-from .tools.file_tool import FileTool
-from .tools.chat_tool import ChatTool
 from .auth.qrz_lookup import QRZLookup
 from .activity_feed import ActivityFeed
 from .banner import get_banner
 from .files.manager import FileManager
 
+if TYPE_CHECKING:
+    # The Anthropic SDK and the tool modules are imported when the Claude
+    # client is first built, keeping them off the startup path
+    from .claude.client import ClaudeClient
+
 
 logger = logging.getLogger(__name__)
 
 
+# Config file used when CONFIG_PATH is not set
+DEFAULT_CONFIG_PATH = "config/config.yaml"
+
+# Background cleanup task intervals (seconds)
+LOG_FLUSH_INTERVAL = 5
+CONNECTION_CLEANUP_INTERVAL = 60
+SESSION_CLEANUP_INTERVAL = 60
+PRESENCE_CLEANUP_INTERVAL = 300
+DATABASE_CLEANUP_INTERVAL = 86400
+
+# Receive loop error backoff bounds (seconds)
+ERROR_BACKOFF_MIN = 0.05
+ERROR_BACKOFF_MAX = 5.0
+
+# Flush immediately once this many query logs are buffered
+LOG_QUEUE_MAX = 10000
+
+# Longest stop() waits for in-flight Claude queries so their logs are written
+QUERY_SHUTDOWN_GRACE = 10.0
+
+# Capture a full traceback for one in this many hot-path errors
+TRACEBACK_SAMPLE_MASK = 0x3f
+
+# Valid /files filter arguments
+_FILE_FILTERS = frozenset({'public', 'private', 'shared', 'mine'})
+
+# Bytes of a stored file shown in the telnet /download preview
+_PREVIEW_BYTES = 512
+
+# Preassembled response framing
+_PROMPT = b"\n> "
+_ERR_PREFIX = b"Error: "
+_ERR_SUFFIX = b"\nPlease try again.\n> "
+_TRUNC_FMT = b"\n\n[Response truncated at %d chars]"
+
+# Maps LF to CR for AX.25 terminals
+_AX25_NL_TABLE = bytes.maketrans(b'\n', b'\r')
+
+# Static replies, encoded once
+_CALLSIGN_PROMPT = b"Welcome to PacketClaude!\n\nCallsign: "
+_GOODBYE = b"73! Goodbye.\n"
+_BUSY = b"Still working on your last question, please wait.\n> "
+_TYPING = b"...\n"
+_INTERNAL_ERROR = b"Internal error. Please try again.\n> "
+_CLEARED = b"Conversation history cleared.\n> "
+_NO_FILES = b"No files found.\n> "
+_INVALID_FILE_ID = b"Invalid file ID. Must be a number.\n> "
+_USAGE_DOWNLOAD = b"Usage: /download <file_id>\n> "
+_USAGE_FILEINFO = b"Usage: /fileinfo <file_id>\n> "
+_USAGE_SHARE = b"Usage: /share <file_id> <callsign>\n> "
+_USAGE_PUBLICFILE = b"Usage: /publicfile <file_id>\n> "
+_USAGE_DELETEFILE = b"Usage: /deletefile <file_id>\n> "
+_DOWNLOAD_FAILED = b"Failed to start download.\n> "
+_UPLOAD_READY = b"Ready to receive file via YAPP. Send ENQ to start.\n"
+_UPLOAD_FAILED = b"Failed to start upload.\n> "
+_DOWNLOAD_DONE = b"\nDownload complete!\n> "
+_TRANSFER_FAILED = b"\nFile transfer failed or was cancelled.\n> "
+_TRANSFER_ERROR = b"\nFile transfer error.\n> "
+_DOWNLOAD_HINT = b"\n\nUse /download <file_id> to download a file."
+_HELP_TEXT = b"""
+PacketClaude Help:
+- Simply type your questions to chat with Claude AI
+- 'help' or '?' - Show this help
+- 'status' - Show rate limit status
+- 'clear' - Clear conversation history
+- Exit: 'quit', 'bye', 'exit', '73', '/exit', 'close', or Ctrl-C
+
+Commands:
+- Check mail, send messages, list sent messages
+- Look up callsigns, get POTA spots, DX cluster spots, search the web
+- Try: "dx cw 20m", "cluster 17m ssb", "pota spots"
+
+File Transfer (via YAPP over AX.25):
+- /upload - Start file upload
+- /files [public|private|shared] - List files
+- /download <id> - Download file by ID
+- /fileinfo <id> - Show file information
+- /share <id> <callsign> - Share file with callsign
+- /publicfile <id> - Make file public
+- /deletefile <id> - Delete file
+
+Your conversation context is preserved during the session.
+> """
+
+# Longest prefix of a message examined for command matching
+_COMMAND_HEAD = 16
+
+# Exact-match BBS commands (lowercased bytes) -> handler method name
+_COMMANDS = {
+    b'help': '_send_help',
+    b'?': '_send_help',
+    b'quit': '_disconnect_cmd',
+    b'bye': '_disconnect_cmd',
+    b'exit': '_disconnect_cmd',
+    b'73': '_disconnect_cmd',
+    b'/exit': '_disconnect_cmd',
+    b'close': '_disconnect_cmd',
+    b'logout': '_disconnect_cmd',
+    b'disconnect': '_disconnect_cmd',
+    b'status': '_send_status',
+    b'clear': '_clear_cmd',
+    b'reset': '_clear_cmd',
+}
+
+# Slash commands with arguments (lowercased first word) ->
+# (handler method name, required argument count, usage reply). Commands with a
+# usage reply take a numeric file ID as their first argument.
+_SLASH_COMMANDS = {
+    b'/files': ('_handle_files_command', 0, None),
+    b'/list': ('_handle_files_command', 0, None),
+    b'/download': ('_handle_download_command', 1, _USAGE_DOWNLOAD),
+    b'/fileinfo': ('_handle_fileinfo_command', 1, _USAGE_FILEINFO),
+    b'/share': ('_handle_share_command', 2, _USAGE_SHARE),
+    b'/publicfile': ('_handle_publicfile_command', 1, _USAGE_PUBLICFILE),
+    b'/deletefile': ('_handle_deletefile_command', 1, _USAGE_DELETEFILE),
+    b'/upload': ('_handle_upload_command', 0, None),
+}
+
+
+def _pin_current_thread(cpus) -> None:
+    """
+    Pin the calling thread to the given CPU cores (Linux only)
+
+    Args:
+        cpus: CPU core numbers; empty means leave scheduling to the OS
+    """
+    if not cpus or not hasattr(os, 'sched_setaffinity'):
+        return
+    try:
+        # pid 0 is the calling thread
+        os.sched_setaffinity(0, set(cpus))
+    except OSError as e:
+        logger.warning(f"Could not pin thread to CPUs {cpus}: {e}")
+
+
+# Tools with no per-application state, shared by every PacketClaude instance in
+# the process so restarts keep their fetch caches: (class, kwargs) -> instance
+_SHARED_TOOLS: Dict[tuple, Any] = {}
+_SHARED_TOOLS_LOCK = threading.Lock()
+
+
+def _shared_tool(cls, **kwargs):
+    """
+    Get a shared instance of a stateless tool, creating it on first use
+
+    Args:
+        cls: Tool class
+        **kwargs: Constructor arguments (part of the cache key)
+
+    Returns:
+        Tool instance
+    """
+    key = (cls, tuple(sorted(kwargs.items())))
+    with _SHARED_TOOLS_LOCK:
+        tool = _SHARED_TOOLS.get(key)
+        if tool is None:
+            tool = _SHARED_TOOLS[key] = cls(**kwargs)
+    return tool
+
+
 class PacketClaude:
     """
     Main PacketClaude application
@@ -103,23 +267,70 @@ class PacketClaude:
         self.connection_handler: Optional[AX25ConnectionHandler] = None
         self.telnet_server: Optional[TelnetServer] = None
         self.radio_control: Optional[RadioControl] = None
-        self.claude_client: Optional[ClaudeClient] = None
+        self._claude_client: Optional['ClaudeClient'] = None
+        self._claude_lock = threading.Lock()
         self.session_manager: Optional[SessionManager] = None
         self.rate_limiter: Optional[RateLimiter] = None
         self.qrz_lookup: Optional[QRZLookup] = None
         self.file_manager: Optional[FileManager] = None
 
+        # Worker pool for Claude queries and the responses waiting to be sent
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.outbound_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._pending_queries: set = set()
+        self._pending_lock = threading.Lock()
+        self._query_futures: set = set()
+
+        # Query and disconnection log rows buffered for a batched database write
+        self._log_queue: deque = deque()
+        self._disconnect_queue: deque = deque()
+        self._log_lock = threading.Lock()
+
+        # Commands bound to their handlers once
+        self._command_handlers = {
+            cmd: getattr(self, name) for cmd, name in _COMMANDS.items()
+        }
+        self._slash_handlers = {
+            cmd: (getattr(self, name), nargs, usage)
+            for cmd, (name, nargs, usage) in _SLASH_COMMANDS.items()
+        }
+
         # Running flag
         self.running = False
 
-        # Setup signal handlers
+        # Set by stop() to wake background threads immediately
+        self._shutdown_evt = threading.Event()
+
+        # Counter used to sample tracebacks on hot-path errors
+        self._trace_sampler = itertools.count()
+
+        # Self-pipe used to wake the main loop's selector on shutdown
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        self._wakeup_recv.setblocking(False)
+        self._wakeup_send.setblocking(False)
+
+        # Set by the signal handler; a plain attribute store is all it does
+        self._shutdown_requested = False
+
+        # Setup signal handlers. The interpreter writes the signal number to the
+        # wakeup socket at delivery time, so the selector returns without the
+        # Python-level handler having to touch locks or sockets.
+        signal.set_wakeup_fd(self._wakeup_send.fileno(), warn_on_full_buffer=False)
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
 
     def _signal_handler(self, signum, frame):
-        """Handle shutdown signals"""
-        logger.info(f"Received signal {signum}, shutting down...")
-        self.stop()
+        """
+        Handle shutdown signals
+
+        Runs between bytecodes of the main thread, possibly while it holds a
+        lock or is mid-write, so it only sets a flag; the wakeup fd has already
+        woken the selector. start() then calls stop() once _run returns.
+        """
+        if not self.running:
+            # Still starting up - abort initialization
+            raise KeyboardInterrupt
+        self._shutdown_requested = True
 
     def start(self):
         """Start PacketClaude"""
@@ -138,6 +349,13 @@ class PacketClaude:
         """Initialize all components"""
         logger.info("Initializing components...")
 
+        # Welcome text never changes at runtime; encode it once
+        self._welcome_bytes = (self.config.welcome_message + "\n").encode('utf-8')
+
+        # Session timeout (0 = drop on disconnect); idle cleanup falls back to 5 min
+        self._session_timeout = self.config.session_timeout
+        self._idle_timeout = self._session_timeout if self._session_timeout > 0 else 300
+
         # Determine which interfaces to enable
         enable_kiss = not self.telnet_only
         enable_telnet = (not self.kiss_only) and (self.config.telnet_enabled or self.telnet_only)
@@ -174,8 +392,13 @@ class PacketClaude:
                     f"Make sure Direwolf is running or use --telnet-only mode"
                 )
 
+            # Channel access and frame pacing belong to the TNC
+            kiss_parameters = self.config.direwolf_kiss_parameters
+            if kiss_parameters:
+                self.kiss_client.configure(kiss_parameters)
+
             # Initialize connection handler
-            callsign, ssid = self._parse_callsign(self.config.station_callsign)
+            callsign, ssid = parse_callsign(self.config.station_callsign)
             self.connection_handler = AX25ConnectionHandler(
                 self.kiss_client,
                 callsign,
@@ -226,7 +449,8 @@ class PacketClaude:
                 model=self.config.radio_model,
                 device=self.config.radio_device,
                 baud=self.config.radio_baud,
-                enabled=True
+                enabled=True,
+                ptt_hang_ms=self.config.radio_ptt_hang_ms
             )
             self.radio_control.connect()
         else:
@@ -236,14 +460,81 @@ class PacketClaude:
                 logger.info("Radio control disabled (telnet-only mode)")
             self.radio_control = DummyRadioControl()
 
-        # Initialize Claude client with tools
+        # Initialize session manager first (needed by BBS tool)
+        self.session_manager = SessionManager(
+            max_messages_per_session=self.config.max_context_messages
+        )
+
+        # Initialize QRZ lookup (needed for QRZ tool and authentication)
+        self.qrz_lookup = QRZLookup(
+            api_key=self.config.qrz_api_key,
+            username=self.config.qrz_username,
+            password=self.config.qrz_password,
+            enabled=self.config.qrz_enabled
+        )
+        if self.config.qrz_enabled:
+            logger.info("QRZ callsign lookup enabled")
+        else:
+            logger.warning("QRZ lookup disabled - no credentials provided")
+
+        # Initialize file manager (needed before file tool)
+        self.file_manager = FileManager(
+            database=self.database,
+            max_file_size=self.config.file_transfer_max_size
+        )
+        logger.info("File manager initialized")
+
+        # Initialize MAIN channel if it doesn't exist
+        logger.info("Ensuring MAIN chat channel exists")
+        self.database.get_or_create_channel("MAIN", "SYSOP", "Main public chat channel")
+
+        # Initialize rate limiter
+        self.rate_limiter = RateLimiter(
+            database=self.database,
+            queries_per_hour=self.config.rate_limit_per_hour,
+            queries_per_day=self.config.rate_limit_per_day,
+            enabled=self.config.rate_limit_enabled
+        )
+
+        # Worker pool so Claude round-trips don't stall frame reception
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.config.max_concurrent_queries,
+            thread_name_prefix="claude",
+            initializer=_pin_current_thread,
+            initargs=(self.config.worker_cpus,)
+        )
+
+        logger.info("All components initialized successfully")
+        self.running = True
+
+    @property
+    def claude_client(self) -> 'ClaudeClient':
+        """Claude API client, built with its tools on first use"""
+        client = self._claude_client
+        if client is None:
+            with self._claude_lock:
+                client = self._claude_client
+                if client is None:
+                    client = self._claude_client = self._build_claude_client()
+        return client
+
+    def _build_claude_client(self) -> 'ClaudeClient':
+        """Build the Claude API client and the tools it can call"""
+        from .claude.client import ClaudeClient
+        from .tools.bbs_session import BBSSessionTool
+        from .tools.message_tool import MessageTool
+        from .tools.file_tool import FileTool
+        from .tools.chat_tool import ChatTool
+
         logger.info("Initializing Claude API client...")
 
         # Initialize tools
         tools = []
         if self.config.search_enabled:
             logger.info("Web search enabled")
-            search_tool = WebSearchTool(
+            from .tools.web_search import WebSearchTool
+            search_tool = _shared_tool(
+                WebSearchTool,
                 max_results=self.config.search_max_results,
                 enabled=True
             )
@@ -251,7 +542,9 @@ class PacketClaude:
 
         if self.config.pota_enabled:
             logger.info("POTA spots tool enabled")
-            pota_tool = POTASpotsTool(
+            from .tools.pota_spots import POTASpotsTool
+            pota_tool = _shared_tool(
+                POTASpotsTool,
                 enabled=True,
                 max_spots=self.config.pota_max_spots
             )
@@ -260,46 +553,35 @@ class PacketClaude:
         # Initialize band conditions tool
         if self.config.band_conditions_enabled:
             logger.info("Band conditions tool enabled")
-            band_conditions_tool = BandConditionsTool(enabled=True)
+            from .tools.band_conditions import BandConditionsTool
+            band_conditions_tool = _shared_tool(BandConditionsTool, enabled=True)
             tools.append(band_conditions_tool)
 
         # Initialize DX Cluster tool
         if self.config.dx_cluster_enabled:
             logger.info("DX Cluster tool enabled")
-            dx_cluster_tool = DXClusterTool(
+            from .tools.dx_cluster import DXClusterTool
+            dx_cluster_tool = _shared_tool(
+                DXClusterTool,
                 enabled=True,
                 max_spots=self.config.dx_cluster_max_spots
             )
             tools.append(dx_cluster_tool)
 
-        # Initialize session manager first (needed by BBS tool)
-        self.session_manager = SessionManager(
-            max_messages_per_session=self.config.max_context_messages
-        )
-
         # Initialize BBS session tool (requires session manager and connection references)
         logger.info("BBS session tool enabled")
         bbs_tool = BBSSessionTool(packetclaude_app=self)
         tools.append(bbs_tool)
 
-        # Initialize QRZ lookup (needed for QRZ tool and authentication)
-        self.qrz_lookup = QRZLookup(
-            api_key=self.config.qrz_api_key,
-            username=self.config.qrz_username,
-            password=self.config.qrz_password,
-            enabled=self.config.qrz_enabled
-        )
         if self.config.qrz_enabled:
-            logger.info("QRZ callsign lookup enabled")
             # Add QRZ lookup tool for Claude
+            from .tools.qrz_tool import QRZTool
             qrz_tool = QRZTool(
                 qrz_lookup=self.qrz_lookup,
                 enabled=True
             )
             tools.append(qrz_tool)
             logger.info("QRZ lookup tool enabled for Claude")
-        else:
-            logger.warning("QRZ lookup disabled - no credentials provided")
 
         # Initialize message tool (always enabled)
         logger.info("Message tool enabled")
@@ -309,13 +591,6 @@ class PacketClaude:
         )
         tools.append(message_tool)
 
-        # Initialize file manager (needed before file tool)
-        self.file_manager = FileManager(
-            database=self.database,
-            max_file_size=self.config.file_transfer_max_size if hasattr(self.config, 'file_transfer_max_size') else None
-        )
-        logger.info("File manager initialized")
-
         # Initialize file tool (always enabled)
         logger.info("File tool enabled")
         file_tool = FileTool(
@@ -332,11 +607,7 @@ class PacketClaude:
         )
         tools.append(chat_tool)
 
-        # Initialize MAIN channel if it doesn't exist
-        logger.info("Ensuring MAIN chat channel exists")
-        self.database.get_or_create_channel("MAIN", "SYSOP", "Main public chat channel")
-
-        self.claude_client = ClaudeClient(
+        return ClaudeClient(
             api_key=self.config.anthropic_api_key,
             model=self.config.claude_model,
             max_tokens=self.config.claude_max_tokens,
@@ -345,17 +616,6 @@ class PacketClaude:
             tools=tools
         )
 
-        # Initialize rate limiter
-        self.rate_limiter = RateLimiter(
-            database=self.database,
-            queries_per_hour=self.config.rate_limit_per_hour,
-            queries_per_day=self.config.rate_limit_per_day,
-            enabled=self.config.rate_limit_enabled
-        )
-
-        logger.info("All components initialized successfully")
-        self.running = True
-
     def _run(self):
         """Main run loop"""
         if self.kiss_client:
@@ -368,106 +628,265 @@ class PacketClaude:
         cleanup_thread = threading.Thread(target=self._cleanup_loop, daemon=True)
         cleanup_thread.start()
 
-        # Main receive loop (only if KISS is enabled)
+        if not self.kiss_client:
+            logger.info("Running in telnet-only mode (no KISS processing)")
+
+        # Keep the receive loop off the cores the Claude workers use
+        _pin_current_thread(self.config.main_cpus)
+
+        # Block in the selector until the TNC has data or stop() wakes us
+        selector = selectors.DefaultSelector()
+        selector.register(self._wakeup_recv, selectors.EVENT_READ)
         if self.kiss_client:
-            while self.running:
+            selector.register(self.kiss_client.fileno(), selectors.EVENT_READ)
+
+            # Hoist hot-loop attribute lookups
+            read_available = self.kiss_client.read_available
+            receive_frame = self.kiss_client.receive_frame_nowait
+            process_frame = self._process_frame
+
+        try:
+            shutdown = self._shutdown_evt
+            backoff = 0.0
+            while not (self._shutdown_requested or shutdown.is_set()):
                 try:
-                    # Receive frame from KISS TNC
-                    frame_data = self.kiss_client.receive_frame(timeout=1.0)
+                    # Deliver Claude responses finished by the worker pool
+                    self._drain_outbound()
+
+                    # No timeout: outbound replies and stop() both write the wakeup pipe
+                    for key, _ in selector.select():
+                        if key.fileobj is self._wakeup_recv:
+                            self._drain_wakeup()
+                            self._drain_outbound()
+                            continue
+
+                        # Read once, then process every complete frame buffered
+                        if not read_available():
+                            selector.unregister(key.fileobj)
+                            raise KISSConnectionLost("Lost connection to Direwolf KISS TNC")
+
+                        while True:
+                            frame_data = receive_frame()
+                            if frame_data is None:
+                                break
+                            process_frame(frame_data)
+
+                    backoff = 0.0
+
+                except KISSConnectionLost:
+                    raise
+                except Exception as e:
+                    # Back off exponentially on repeated errors to avoid a tight loop
+                    backoff = min(max(backoff * 2, ERROR_BACKOFF_MIN), ERROR_BACKOFF_MAX)
+                    logger.error(f"Error in receive loop: {e} (retrying in {backoff:.2f}s)")
+                    shutdown.wait(backoff)
+        finally:
+            selector.close()
+
+    def _process_frame(self, frame_data: bytes):
+        """Decode and dispatch a single received AX.25 frame"""
+        try:
+            # Decode AX.25 frame
+            frame = AX25Frame.decode(frame_data)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Received frame: %s", frame)
+
+            # Handle frame
+            self.connection_handler.handle_incoming_frame(frame)
 
-                    if frame_data:
-                        try:
-                            # Decode AX.25 frame
-                            frame = AX25Frame.decode(frame_data)
-                            logger.debug(f"Received frame: {frame}")
+        except Exception as e:
+            want_tb = self._want_traceback()
+            logger.warning("Error processing frame: %r", e, exc_info=want_tb)
+            self.activity_logger.log_error(
+                "FrameProcessing", str(e), exception=e if want_tb else None
+            )
 
-                            # Handle frame
-                            self.connection_handler.handle_incoming_frame(frame)
+    def _want_traceback(self) -> bool:
+        """Decide whether to capture a traceback for a hot-path error (sampled)"""
+        return (next(self._trace_sampler) & TRACEBACK_SAMPLE_MASK) == 0
 
-                        except Exception as e:
-                            logger.error(f"Error processing frame: {e}")
-                            self.activity_logger.log_error("FrameProcessing", str(e), exception=e)
+    def _drain_outbound(self):
+        """Send AX.25 responses queued by Claude worker threads"""
+        while True:
+            try:
+                connection, text = self.outbound_queue.get_nowait()
+            except queue.Empty:
+                return
+            self._send_to_station(connection, text)
 
-                except Exception as e:
-                    logger.error(f"Error in receive loop: {e}")
-                    time.sleep(1)  # Prevent tight loop on errors
-        else:
-            # Telnet-only mode - just keep running
-            logger.info("Running in telnet-only mode (no KISS processing)")
-            while self.running:
-                time.sleep(1)
+    def _queue_outbound(self, connection, text: Union[str, bytes, bytearray]):
+        """Queue a response for the main loop (AX.25) or telnet server to send"""
+        if isinstance(connection, TelnetConnection):
+            # Sent from the telnet callback pool, so a stalled client's
+            # sendall() can never hold up frame reception in _run
+            if self.telnet_server:
+                if isinstance(text, str):
+                    text = text.encode('utf-8')
+                self.telnet_server.send_data_async(connection, text)
+            return
+
+        self.outbound_queue.put((connection, text))
+        self._wakeup()
+
+    def _wakeup(self):
+        """Wake the main loop's selector"""
+        try:
+            self._wakeup_send.send(b'\x00')
+        except (BlockingIOError, OSError):
+            # Pipe already full or closed - the loop is waking up anyway
+            pass
+
+    def _drain_wakeup(self):
+        """Consume pending wakeup bytes"""
+        try:
+            while self._wakeup_recv.recv(64):
+                pass
+        except (BlockingIOError, OSError):
+            pass
 
     def _cleanup_loop(self):
         """Background cleanup loop"""
+        tasks = {
+            'logs': (LOG_FLUSH_INTERVAL, self._flush_logs),
+            'conn': (CONNECTION_CLEANUP_INTERVAL, self._cleanup_connections),
+            'sess': (SESSION_CLEANUP_INTERVAL, self._cleanup_sessions),
+            'presence': (PRESENCE_CLEANUP_INTERVAL, self._cleanup_presence),
+            'db': (DATABASE_CLEANUP_INTERVAL, self._cleanup_database),
+        }
+
+        # Every task runs once at startup, then on its interval, so a
+        # daily task still runs on installs restarted more often than that
+        start = time.monotonic()
+        deadlines = {name: start for name in tasks}
+
         while self.running:
-            try:
-                # Sleep for 60 seconds
-                time.sleep(60)
+            now = time.monotonic()
+
+            for name, (interval, task) in tasks.items():
+                if now < deadlines[name]:
+                    continue
+                deadlines[name] = now + interval
+                try:
+                    task()
+                except Exception as e:
+                    logger.error(f"Error in cleanup loop ({name}): {e}")
 
-                if not self.running:
-                    break
+            # Sleep until the next task is due, or until stop() is called
+            if self._shutdown_evt.wait(timeout=max(0, min(deadlines.values()) - time.monotonic())):
+                break
 
-                # Cleanup stale connections
-                if self.connection_handler:
-                    self.connection_handler.cleanup_stale_connections(
-                        timeout=self.config.session_timeout if self.config.session_timeout > 0 else 300
-                    )
+    def _cleanup_connections(self):
+        """Remove stale AX.25 and telnet connections"""
+        timeout = self._idle_timeout
 
-                # Cleanup stale telnet connections
-                if self.telnet_server:
-                    self.telnet_server.cleanup_stale_connections(
-                        timeout=self.config.session_timeout if self.config.session_timeout > 0 else 300
-                    )
+        # Cleanup stale connections
+        if self.connection_handler:
+            self.connection_handler.cleanup_stale_connections(timeout=timeout)
 
-                # Cleanup idle sessions
-                self.session_manager.cleanup_idle_sessions(
-                    timeout=self.config.session_timeout if self.config.session_timeout > 0 else 300
-                )
+        # Cleanup stale telnet connections
+        if self.telnet_server:
+            self.telnet_server.cleanup_stale_connections(timeout=timeout)
 
-                # Cleanup old database data (keep 30 days)
-                self.database.cleanup_old_data(days=30)
+    def _cleanup_sessions(self):
+        """Remove idle sessions and forget idle rate-limit state"""
+        # Cleanup idle sessions
+        self.session_manager.cleanup_idle_sessions(
+            timeout=self._idle_timeout
+        )
 
-                # Cleanup stale chat presence (1 hour inactive)
-                self.database.cleanup_stale_presence(hours=1)
+        # Forget rate-limit buckets for stations that have gone quiet
+        self.rate_limiter.cleanup_buckets()
+
+        # One activity log line per station that hit its limit, not per message
+        for callsign, count in self.rate_limiter.pop_rejections().items():
+            self.activity_logger.log_rate_limit(callsign, f"{count} queries rejected")
+
+        # Log statistics
+        if logger.isEnabledFor(logging.DEBUG):
+            stats = self.session_manager.get_stats()
+            logger.debug("Active sessions: %d", stats['active_sessions'])
+
+    def _cleanup_presence(self):
+        """Remove stale chat presence (1 hour inactive)"""
+        self.database.cleanup_stale_presence(hours=1)
+
+    def _cleanup_database(self):
+        """Remove old database data (keep 30 days)"""
+        self.database.cleanup_old_data(days=30)
+
+    def _query_done(self, future: Future):
+        """Forget a finished Claude query future"""
+        with self._pending_lock:
+            self._query_futures.discard(future)
+
+    def _queue_query_log(self, entry: dict):
+        """Buffer a query log row for the next batched database write"""
+        # Stamped now, not when the batch is written
+        entry['timestamp'] = datetime.utcnow()
+        with self._log_lock:
+            self._log_queue.append(entry)
+            backlog = len(self._log_queue)
+
+        # Bound memory if the flusher falls behind
+        if backlog >= LOG_QUEUE_MAX:
+            self._flush_logs()
+
+    def _pending_query_logs(self, callsign: str) -> int:
+        """Count buffered successful queries for a callsign (rate limits count these)"""
+        callsign = callsign.upper()
+        with self._log_lock:
+            return sum(
+                1 for entry in self._log_queue
+                if entry['callsign'].upper() == callsign and not entry.get('error')
+            )
+
+    def _flush_logs(self):
+        """Write all buffered query and disconnection logs"""
+        with self._log_lock:
+            if not self._log_queue and not self._disconnect_queue:
+                return
+            pending = self._log_queue
+            disconnects = self._disconnect_queue
+            self._log_queue = deque()
+            self._disconnect_queue = deque()
 
-                # Log statistics
-                stats = self.session_manager.get_stats()
-                logger.debug(f"Active sessions: {stats['active_sessions']}")
+        if pending:
+            try:
+                self.database.log_queries(list(pending))
+            except Exception as e:
+                logger.error(f"Failed to write {len(pending)} query logs: {e}")
 
+        if disconnects:
+            try:
+                self.database.log_disconnections(list(disconnects))
             except Exception as e:
-                logger.error(f"Error in cleanup loop: {e}")
+                logger.error(f"Failed to write {len(disconnects)} disconnection logs: {e}")
 
     def _on_connect(self, connection: AX25Connection):
         """Handle new connection"""
-        logger.info(f"New connection from {connection.remote_address}")
+        addr = connection.remote_address
+        logger.info(f"New connection from {addr}")
 
         # Log connection to database
-        connection_id = self.database.log_connection(connection.remote_address)
+        connection_id = self.database.log_connection(addr)
         connection.connection_id = connection_id
 
-        self.activity_logger.log_connection(connection.remote_address, connection_id)
+        self.activity_logger.log_connection(addr, connection_id)
 
         # Check if this is a telnet connection without a callsign (IP:port format)
         # or if the session isn't authenticated yet
-        session = self.session_manager.get_session(connection.remote_address)
+        session = self.session_manager.get_session(addr)
 
         if not session.authenticated:
-            # Check if connection ID looks like a callsign (not IP:port)
-            import re
-            if re.match(r'^\d+\.\d+\.\d+\.\d+:\d+$', connection.remote_address):
-                # IP:port format - need callsign
-                prompt = (
-                    "Welcome to PacketClaude!\n\n"
-                    "Callsign: "
-                )
-                self._send_to_station(connection, prompt)
+            # Telnet clients that haven't given a callsign are known by IP:port
+            if isinstance(connection, TelnetConnection) and not connection.callsign:
+                self._send_to_station(connection, _CALLSIGN_PROMPT)
             else:
                 # Has callsign - authenticate it
-                self._authenticate_callsign(connection, connection.remote_address)
+                self._authenticate_callsign(connection, addr)
         else:
             # Already authenticated, send welcome
-            welcome = self.config.welcome_message + "\n"
-            self._send_to_station(connection, welcome)
+            self._send_to_station(connection, self._welcome_bytes)
 
     def _authenticate_callsign(self, connection, callsign: str):
         """
@@ -477,6 +896,8 @@ class PacketClaude:
             connection: The connection
             callsign: Callsign to authenticate
         """
+        # Interned: it keys sessions, presence and the activity feed from here on
+        callsign = sys.intern(callsign.upper())
         logger.info(f"Authenticating callsign: {callsign}")
 
         # Look up on QRZ
@@ -498,46 +919,37 @@ class PacketClaude:
         # For telnet connections, update the callsign
         if isinstance(connection, TelnetConnection) and not connection.callsign:
             connection.set_callsign(callsign)
-            # Update session manager key
-            new_address = connection.remote_address  # Now returns callsign
-            if old_address != new_address and old_address in self.session_manager.sessions:
-                self.session_manager.sessions[new_address] = self.session_manager.sessions[old_address]
-                del self.session_manager.sessions[old_address]
-
-            # Update telnet server connections dict
-            if old_address != new_address and old_address in self.telnet_server.connections:
-                logger.debug(f"Updating telnet connections dict: {old_address} -> {new_address}")
-                self.telnet_server.connections[new_address] = self.telnet_server.connections[old_address]
-                del self.telnet_server.connections[old_address]
-
-        # Send banner with station info
+            # The session stays under its IP:port key; the callsign (which
+            # remote_address now returns) resolves to it through an alias
+            self.session_manager.add_alias(connection.remote_address, old_address)
+
+        # Banner, activity feed, mail notice and welcome go out as one payload
+        # so the station gets full frames instead of a burst of small ones
         grid = operator_info.get('grid', '')
         station_callsign = self.config.station_callsign
         banner = get_banner(station_callsign, grid)
-        self._send_to_station(connection, "\n" + banner + "\n")
+        parts = ["\n", banner, "\n"]
 
         # Add activity feed
         activity_summary = self.activity_feed.get_recent_summary(max_items=2, max_age_minutes=30)
-        self._send_to_station(connection, activity_summary + "\n")
+        parts += [activity_summary, "\n"]
 
         # Check for unread mail
         unread_count = self.database.get_unread_count(callsign)
         if unread_count > 0:
             if unread_count == 1:
-                mail_notice = "You have 1 new message. Type 'check mail' to read it.\n"
+                parts.append("You have 1 new message. Type 'check mail' to read it.\n")
             else:
-                mail_notice = f"You have {unread_count} new messages. Type 'check mail' to read them.\n"
-            self._send_to_station(connection, mail_notice)
-        self._send_to_station(connection, "\n")
+                parts.append(f"You have {unread_count} new messages. Type 'check mail' to read them.\n")
+        parts.append("\n")
 
         # Track connection activity
         self.activity_feed.add_activity(callsign, 'connect')
 
-        # Send quick welcome and get to prompt
+        # Quick welcome and get to prompt
         fullname = operator_info.get('fullname', callsign)
-
-        welcome_text = f"Welcome {fullname} ({callsign})!\nType 'help' for commands.\n"
-        self._send_to_station(connection, welcome_text + "> ")
+        parts += [f"Welcome {fullname} ({callsign})!\nType 'help' for commands.\n", "> "]
+        self._send_to_station(connection, "".join(parts))
 
         logger.info(f"Successfully authenticated {callsign} - {fullname}")
 
@@ -549,48 +961,54 @@ class PacketClaude:
         self.database.leave_all_channels(connection.remote_address)
 
         # Log disconnection
-        if hasattr(connection, 'connection_id'):
-            self.database.log_disconnection(
-                connection.connection_id,
-                connection.packets_sent,
-                connection.packets_received
-            )
+        connection_id = connection.connection_id
+        if connection_id is not None:
+            # Written with the next batched log flush
+            with self._log_lock:
+                self._disconnect_queue.append({
+                    'connection_id': connection_id,
+                    'packets_sent': connection.packets_sent,
+                    'packets_received': connection.packets_received,
+                    'disconnected_at': datetime.utcnow(),
+                })
 
         # Calculate duration
         duration = None
-        if connection.connected_at:
-            duration = time.time() - connection.connected_at
+        if connection.connected_mono is not None:
+            duration = time.monotonic() - connection.connected_mono
 
         self.activity_logger.log_disconnection(
             connection.remote_address,
-            getattr(connection, 'connection_id', None),
+            connection_id,
             duration
         )
 
         # Remove session if configured
-        if self.config.session_timeout == 0:
+        if self._session_timeout == 0:
             self.session_manager.remove_session(connection.remote_address)
 
     def _on_data(self, connection: AX25Connection, data: bytes):
         """Handle incoming data from connection"""
+        addr = connection.remote_address
+        send = self._send_to_station
         try:
-            # Decode data as text
-            message = data.decode('utf-8', errors='ignore').strip()
-
-            if not message:
+            raw = data.strip()
+            if not raw:
                 return
 
+            # Decode data as text
+            message = raw.decode('utf-8', errors='ignore')
+
             # Check if session is authenticated
-            session = self.session_manager.get_session(connection.remote_address)
+            session = self.session_manager.get_session(addr)
 
             if not session.authenticated:
                 # Treat message as callsign attempt
-                callsign = message.upper().strip()
+                callsign = message.upper()
 
                 # Basic format validation
-                import re
-                if not re.match(r'^[A-Z0-9]{1,2}[0-9][A-Z0-9]{1,4}(-[0-9]{1,2})?$', callsign):
-                    self._send_to_station(connection,
+                if not CALLSIGN_RE.match(callsign):
+                    send(connection,
                         "\nInvalid callsign format. Please enter a valid amateur radio callsign: ")
                     return
 
@@ -598,233 +1016,297 @@ class PacketClaude:
                 self._authenticate_callsign(connection, callsign)
                 return
 
-            logger.info(f"Message from {connection.remote_address}: {message}")
+            logger.info("Message from %s: %s", addr, message)
 
-            # Handle special commands
-            if message.lower() in ['help', '?']:
-                self._send_help(connection)
-                return
-            elif message.lower() in ['quit', 'bye', 'exit', '73', '/exit', 'close', 'logout', 'disconnect']:
-                logger.info(f"Exit command from {connection.remote_address}")
-                self._send_to_station(connection, "73! Goodbye.\n")
-                # Give time for message to be sent before disconnecting
-                time.sleep(0.5)
-                # Disconnect based on connection type
-                if isinstance(connection, TelnetConnection):
-                    self.telnet_server.disconnect(connection)
-                else:
-                    self.connection_handler.disconnect(connection)
-                return
-            elif message.lower() == 'status':
-                self._send_status(connection)
-                return
-            elif message.lower() in ['clear', 'reset']:
-                self.session_manager.clear_session(connection.remote_address)
-                self._send_to_station(connection, "Conversation history cleared.\n> ")
-                return
-            elif message.lower().startswith('/files') or message.lower().startswith('/list'):
-                self._handle_files_command(connection, message)
-                return
-            elif message.lower().startswith('/download'):
-                self._handle_download_command(connection, message)
-                return
-            elif message.lower().startswith('/fileinfo'):
-                self._handle_fileinfo_command(connection, message)
-                return
-            elif message.lower().startswith('/share'):
-                self._handle_share_command(connection, message)
+            # Handle special commands (matched on the raw bytes). Every command
+            # is shorter than _COMMAND_HEAD, so long queries only lowercase a prefix
+            raw_lc = raw[:_COMMAND_HEAD].lower()
+            handler = self._command_handlers.get(raw_lc)
+            if handler:
+                handler(connection)
                 return
-            elif message.lower().startswith('/publicfile'):
-                self._handle_publicfile_command(connection, message)
-                return
-            elif message.lower().startswith('/deletefile'):
-                self._handle_deletefile_command(connection, message)
-                return
-            elif message.lower().startswith('/upload'):
-                self._handle_upload_command(connection, message)
+            elif raw_lc[:1] == b'/':
+                # File commands take arguments, so dispatch on the first word
+                entry = self._slash_handlers.get(raw_lc.split(None, 1)[0])
+                if entry:
+                    self._dispatch_slash(connection, message, *entry)
+                    return
+
+            # Only one Claude query per station at a time, so history stays ordered
+            with self._pending_lock:
+                query_pending = addr in self._pending_queries
+            if query_pending:
+                send(connection, _BUSY)
                 return
 
             # Check rate limits
-            allowed, reason = self.rate_limiter.check_limit(connection.remote_address)
+            # Buffered log rows are only counted when the limiter has to
+            # seed this station from the database
+            allowed, reason = self.rate_limiter.check_limit(
+                addr,
+                pending=functools.partial(self._pending_query_logs, addr)
+            )
             if not allowed:
-                self.activity_logger.log_rate_limit(connection.remote_address, reason)
-                self._send_to_station(
+                # Counted by the rate limiter and summarized in _cleanup_sessions
+                self._send_with_prompt(
                     connection,
                     f"Rate limit exceeded: {reason}\n"
-                    "Please try again later. Type 'status' for details.\n> "
+                    "Please try again later. Type 'status' for details."
                 )
                 return
 
+            with self._pending_lock:
+                self._pending_queries.add(addr)
+
             # Log query
             self.activity_logger.log_query(
-                connection.remote_address,
+                addr,
                 message,
-                getattr(connection, 'connection_id', None)
+                connection.connection_id
+            )
+
+            # Send typing indicator
+            send(connection, _TYPING)
+
+            # Query Claude on the worker pool; the response is sent by _run
+            future = self.executor.submit(self._query_claude, connection, message)
+            with self._pending_lock:
+                self._query_futures.add(future)
+            future.add_done_callback(self._query_done)
+
+        except Exception as e:
+            want_tb = self._want_traceback()
+            logger.warning("Error handling data: %r", e, exc_info=want_tb)
+            self.activity_logger.log_error(
+                "DataHandling",
+                str(e),
+                addr,
+                e if want_tb else None
             )
+            send(connection, _INTERNAL_ERROR)
 
+    def _query_claude(self, connection: AX25Connection, message: str):
+        """Run a Claude query on a worker thread and queue the response"""
+        address = connection.remote_address
+        cid = connection.connection_id
+        try:
             # Get conversation history
-            history = self.session_manager.get_history(connection.remote_address)
+            history = self.session_manager.turn_begin(address)
 
             # Add connection context to message for tool use
             # This helps Claude know which connection is making the request
             connection_type = "telnet" if isinstance(connection, TelnetConnection) else "ax25"
-            message_with_context = f"[Connection: {connection.remote_address} via {connection_type}] {message}"
-
-            # Send typing indicator
-            self._send_to_station(connection, "...\n")
+            message_with_context = f"[Connection: {address} via {connection_type}] {message}"
 
             # Query Claude
-            start_time = time.time()
+            start_ns = time.monotonic_ns()
             response_text, tokens_used, error = self.claude_client.send_message(
                 message_with_context,
                 history
             )
-            response_time_ms = int((time.time() - start_time) * 1000)
+            response_time_ms = (time.monotonic_ns() - start_ns) // 1_000_000
 
             if error:
                 # Handle error
                 self.activity_logger.log_error(
                     "ClaudeAPI",
                     error,
-                    connection.remote_address
+                    address
                 )
 
-                # Log to database
-                self.database.log_query(
-                    callsign=connection.remote_address,
-                    query=message,
-                    error=error,
-                    connection_id=getattr(connection, 'connection_id', None)
-                )
+                # Failed queries don't count against the rate limit
+                self.rate_limiter.refund(address)
 
-                self._send_to_station(
+                # Log to database
+                self._queue_query_log({
+                    'callsign': address,
+                    'query': message,
+                    'error': error,
+                    'connection_id': cid,
+                })
+
+                self._queue_outbound(
                     connection,
-                    f"Error: {error}\nPlease try again.\n> "
+                    _ERR_PREFIX + error.encode('utf-8') + _ERR_SUFFIX
                 )
                 return
 
+            # Truncate once; history keeps what the station actually received
+            max_chars = self.config.max_response_chars
+            truncated = len(response_text) > max_chars
+            sent_text = response_text[:max_chars] if truncated else response_text
+
             # Update session history
-            self.session_manager.add_user_message(connection.remote_address, message)
-            self.session_manager.add_assistant_message(connection.remote_address, response_text)
+            self.session_manager.turn_commit(address, message, sent_text)
 
             # Track activity for feed
-            self.activity_feed.add_activity(connection.remote_address, 'query')
+            self.activity_feed.add_activity(address, 'query')
 
             # Log response
             self.activity_logger.log_response(
-                connection.remote_address,
+                address,
                 len(response_text),
                 tokens_used,
                 response_time_ms,
-                getattr(connection, 'connection_id', None)
+                cid
             )
 
             # Log to database
-            self.database.log_query(
-                callsign=connection.remote_address,
-                query=message,
-                response=response_text,
-                tokens_used=tokens_used,
-                response_time_ms=response_time_ms,
-                connection_id=getattr(connection, 'connection_id', None)
-            )
-
-            # Truncate response if too long
-            max_chars = self.config.max_response_chars
-            if len(response_text) > max_chars:
-                response_text = response_text[:max_chars]
-                response_text += f"\n\n[Response truncated at {max_chars} chars]"
-
-            # Send response with prompt
-            self._send_to_station(connection, response_text + "\n> ")
+            self._queue_query_log({
+                'callsign': address,
+                'query': message,
+                'response': response_text,
+                'tokens_used': tokens_used,
+                'response_time_ms': response_time_ms,
+                'connection_id': cid,
+            })
+
+            # Build the outgoing payload (response, truncation note, prompt)
+            # with a single join rather than growing a buffer piece by piece
+            if truncated:
+                payload = b"".join((sent_text.encode('utf-8'), _TRUNC_FMT % max_chars, _PROMPT))
+            else:
+                payload = b"".join((sent_text.encode('utf-8'), _PROMPT))
+            self._queue_outbound(connection, payload)
 
         except Exception as e:
-            logger.error(f"Error handling data: {e}", exc_info=True)
+            want_tb = self._want_traceback()
+            logger.warning("Error handling query: %r", e, exc_info=want_tb)
             self.activity_logger.log_error(
                 "DataHandling",
                 str(e),
-                connection.remote_address,
-                e
+                address,
+                e if want_tb else None
             )
-            self._send_to_station(connection, "Internal error. Please try again.\n> ")
 
-    def _send_to_station(self, connection, message: str):
-        """Send message to connected station"""
+            # The station got no answer, so don't charge it for the query
+            self.rate_limiter.refund(address)
+
+            self._queue_outbound(connection, _INTERNAL_ERROR)
+
+        finally:
+            with self._pending_lock:
+                self._pending_queries.discard(address)
+
+    def _send_to_station(self, connection, message: Union[str, bytes, bytearray]):
+        """Send message (text or UTF-8 bytes) to connected station"""
         try:
+            if isinstance(message, str):
+                payload = message.encode('utf-8')
+            else:
+                payload = message
+
             # Check connection type
             if isinstance(connection, TelnetConnection):
                 # Telnet connection - send directly
-                self.telnet_server.send_data(connection, message.encode('utf-8'))
+                self.telnet_server.send_data(connection, payload)
             else:
                 # AX.25 connection - convert newlines to \r for packet radio terminals
-                # Packet radio terminals typically use \r for line endings
-                message = message.replace('\r\n', '\n').replace('\n', '\r')
-
-                # Split message into chunks if needed (max ~256 bytes per packet)
-                chunk_size = 200
-                for i in range(0, len(message), chunk_size):
-                    chunk = message[i:i + chunk_size]
-                    self.connection_handler.send_data(connection, chunk.encode('utf-8'))
-                    time.sleep(0.1)  # Small delay between packets
+                # Packet radio terminals typically use \r for line endings.
+                # Only CRLF needs a replace; bare LFs are mapped in one translate
+                if b'\r\n' in payload:
+                    payload = payload.replace(b'\r\n', b'\r')
+                payload = payload.translate(_AX25_NL_TABLE)
+
+                # Split into PACLEN-sized frames and hand them to the TNC in one write
+                self.connection_handler.send_payload(connection, payload)
         except Exception as e:
             logger.error(f"Error sending to station: {e}")
 
-    def _send_help(self, connection: AX25Connection):
-        """Send help message"""
-        help_text = """
-PacketClaude Help:
-- Simply type your questions to chat with Claude AI
-- 'help' or '?' - Show this help
-- 'status' - Show rate limit status
-- 'clear' - Clear conversation history
-- Exit: 'quit', 'bye', 'exit', '73', '/exit', 'close', or Ctrl-C
+    def _send_with_prompt(self, connection, *parts: Union[str, bytes]):
+        """
+        Send a reply followed by the prompt as one payload
 
-Commands:
-- Check mail, send messages, list sent messages
-- Look up callsigns, get POTA spots, DX cluster spots, search the web
-- Try: "dx cw 20m", "cluster 17m ssb", "pota spots"
+        Args:
+            connection: Connection to reply to
+            *parts: Reply text or UTF-8 bytes, without the trailing prompt
+        """
+        chunks = [p.encode('utf-8') if isinstance(p, str) else p for p in parts]
+        chunks.append(_PROMPT)
+        self._send_to_station(connection, b"".join(chunks))
 
-File Transfer (via YAPP over AX.25):
-- /upload - Start file upload
-- /files [public|private|shared] - List files
-- /download <id> - Download file by ID
-- /fileinfo <id> - Show file information
-- /share <id> <callsign> - Share file with callsign
-- /publicfile <id> - Make file public
-- /deletefile <id> - Delete file
+    def _send_error(self, connection, error: str):
+        """Send an 'Error: ...' reply followed by the prompt"""
+        self._send_to_station(connection, b"".join((_ERR_PREFIX, str(error).encode('utf-8'), _PROMPT)))
 
-Your conversation context is preserved during the session.
-"""
-        self._send_to_station(connection, help_text + "> ")
+    def _send_help(self, connection: AX25Connection):
+        """Send help message"""
+        self._send_to_station(connection, _HELP_TEXT)
 
     def _send_status(self, connection: AX25Connection):
         """Send status information"""
-        status = self.rate_limiter.get_status(connection.remote_address)
+        status = self.rate_limiter.get_status(
+            connection.remote_address,
+            pending=functools.partial(self._pending_query_logs, connection.remote_address)
+        )
         status_text = self.rate_limiter.format_limit_message(status)
 
         session = self.session_manager.get_session(connection.remote_address)
         status_text += f"\n\nSession: {len(session.messages)} messages in history"
 
-        self._send_to_station(connection, status_text + "\n> ")
+        self._send_with_prompt(connection, status_text)
 
-    @staticmethod
-    def _parse_callsign(callsign_str: str) -> tuple:
-        """Parse callsign string into callsign and SSID"""
-        if '-' in callsign_str:
-            parts = callsign_str.split('-')
-            return parts[0].strip().upper(), int(parts[1])
-        return callsign_str.strip().upper(), 0
+    def _disconnect_cmd(self, connection: AX25Connection):
+        """Handle exit commands - say goodbye and disconnect"""
+        logger.info(f"Exit command from {connection.remote_address}")
+        self._send_to_station(connection, _GOODBYE)
+        # Let the goodbye reach the station before disconnecting
+        connection.drain(timeout=1.0)
+        # Disconnect based on connection type
+        if isinstance(connection, TelnetConnection):
+            self.telnet_server.disconnect(connection)
+        else:
+            self.connection_handler.disconnect(connection)
+
+    def _clear_cmd(self, connection: AX25Connection):
+        """Handle clear/reset commands - clear conversation history"""
+        self.session_manager.clear_session(connection.remote_address)
+        self._send_to_station(connection, _CLEARED)
 
     # File transfer command handlers
 
-    def _handle_files_command(self, connection: AX25Connection, message: str):
+    def _dispatch_slash(self, connection: AX25Connection, message: str,
+                        handler, nargs: int, usage: Optional[bytes]):
+        """
+        Parse a slash command's arguments and call its handler
+
+        File commands (those with a usage reply) get their argument count and
+        file ID checked here, so each handler receives an int file ID.
+
+        Args:
+            connection: The connection
+            message: Full command line
+            handler: Bound handler method
+            nargs: Required argument count
+            usage: Usage reply, or None for commands without a file ID
+        """
+        # Only the leading arguments are read, so cap the split and drop any
+        # trailing text rather than tokenizing the whole line
+        wanted = max(nargs, 1)
+        args = message.split(None, wanted + 1)[1:wanted + 1]
+        if usage is None:
+            handler(connection, args)
+            return
+
+        if len(args) < nargs:
+            self._send_to_station(connection, usage)
+            return
+
+        try:
+            file_id = int(args[0])
+        except ValueError:
+            self._send_to_station(connection, _INVALID_FILE_ID)
+            return
+
+        handler(connection, file_id, args[1:])
+
+    def _handle_files_command(self, connection: AX25Connection, args: list):
         """Handle /files command - list files"""
-        parts = message.split()
         access_filter = None
 
-        if len(parts) >= 2:
-            filter_arg = parts[1].lower()
-            if filter_arg in ['public', 'private', 'shared', 'mine']:
+        if args:
+            filter_arg = args[0].lower()
+            if filter_arg in _FILE_FILTERS:
                 if filter_arg == 'mine':
                     access_filter = None  # Will filter by owner in list
                 else:
@@ -837,50 +1319,46 @@ Your conversation context is preserved during the session.
             )
 
             if not files:
-                self._send_to_station(connection, "No files found.\n> ")
+                self._send_to_station(connection, _NO_FILES)
                 return
 
             # Format file list
             file_list = self.file_manager.format_file_list(files)
-            self._send_to_station(connection, file_list + "\n\nUse /download <file_id> to download a file.\n> ")
+            self._send_with_prompt(connection, file_list, _DOWNLOAD_HINT)
 
         except Exception as e:
-            logger.error(f"Error listing files: {e}", exc_info=True)
-            self._send_to_station(connection, f"Error listing files: {e}\n> ")
+            logger.error("Error listing files: %r", e, exc_info=self._want_traceback())
+            self._send_with_prompt(connection, f"Error listing files: {e}")
 
-    def _handle_download_command(self, connection: AX25Connection, message: str):
+    def _handle_download_command(self, connection: AX25Connection, file_id: int, args: list):
         """Handle /download command - download a file"""
-        parts = message.split()
-
-        if len(parts) < 2:
-            self._send_to_station(connection, "Usage: /download <file_id>\n> ")
-            return
-
-        try:
-            file_id = int(parts[1])
-        except ValueError:
-            self._send_to_station(connection, "Invalid file ID. Must be a number.\n> ")
-            return
-
         # Get file
         file_dict, error = self.file_manager.download_file(file_id, connection.remote_address)
 
         if error:
-            self._send_to_station(connection, f"Error: {error}\n> ")
+            self._send_error(connection, error)
             return
 
         # Start YAPP download
         if isinstance(connection, TelnetConnection):
             if self.telnet_server:
                 # For telnet, we can't use YAPP, just send the file info
-                self._send_to_station(connection,
+                file_size = file_dict['file_size']
+                preview = self._text_preview(file_dict['file_data'])
+                if preview is None:
+                    body = f"<binary file, {file_size} bytes, use AX.25 to transfer>"
+                else:
+                    body = (
+                        f"File contents (text preview):\n"
+                        f"{'='*50}\n"
+                        f"{preview}\n"
+                        f"{'='*50}"
+                    )
+                self._send_with_prompt(connection,
                     f"File: {file_dict['filename']}\n"
-                    f"Size: {self.file_manager.format_file_size(file_dict['file_size'])}\n"
-                    f"Note: YAPP file transfer is only supported over AX.25.\n"
-                    f"File contents (text preview):\n"
-                    f"{'='*50}\n"
-                    f"{file_dict['file_data'][:500].decode('utf-8', errors='replace')}\n"
-                    f"{'='*50}\n> "
+                    f"Size: {self.file_manager.format_file_size(file_size)}\n"
+                    f"Note: YAPP file transfer is only supported over AX.25.\n",
+                    body
                 )
         else:
             # AX.25 connection - use YAPP
@@ -892,26 +1370,35 @@ Your conversation context is preserved during the session.
             )
 
             if not success:
-                self._send_to_station(connection, "Failed to start download.\n> ")
+                self._send_to_station(connection, _DOWNLOAD_FAILED)
 
-    def _handle_fileinfo_command(self, connection: AX25Connection, message: str):
-        """Handle /fileinfo command - show file information"""
-        parts = message.split()
+    @staticmethod
+    def _text_preview(file_data: bytes) -> Optional[str]:
+        """
+        Decode the head of a stored file for the telnet preview
 
-        if len(parts) < 2:
-            self._send_to_station(connection, "Usage: /fileinfo <file_id>\n> ")
-            return
+        Args:
+            file_data: File contents
 
+        Returns:
+            Decoded preview text, or None if the file looks binary
+        """
+        head = file_data[:_PREVIEW_BYTES]
+        if b'\x00' in head:
+            return None
+        # Incremental decode so a multi-byte character cut at the
+        # preview boundary isn't mistaken for binary data
         try:
-            file_id = int(parts[1])
-        except ValueError:
-            self._send_to_station(connection, "Invalid file ID. Must be a number.\n> ")
-            return
+            return codecs.getincrementaldecoder('utf-8')().decode(head)
+        except UnicodeDecodeError:
+            return None
 
+    def _handle_fileinfo_command(self, connection: AX25Connection, file_id: int, args: list):
+        """Handle /fileinfo command - show file information"""
         file_info, error = self.file_manager.get_file_info(file_id, connection.remote_address)
 
         if error:
-            self._send_to_station(connection, f"Error: {error}\n> ")
+            self._send_error(connection, error)
             return
 
         info_text = f"""
@@ -923,25 +1410,12 @@ File Information:
   Access: {file_info['access_level']}
   Uploaded: {file_info['uploaded_at']}
   Downloads: {file_info['download_count']}
-  Description: {file_info['description'] or 'None'}
-"""
-        self._send_to_station(connection, info_text + "> ")
+  Description: {file_info['description'] or 'None'}"""
+        self._send_with_prompt(connection, info_text)
 
-    def _handle_share_command(self, connection: AX25Connection, message: str):
+    def _handle_share_command(self, connection: AX25Connection, file_id: int, args: list):
         """Handle /share command - share file with callsign"""
-        parts = message.split()
-
-        if len(parts) < 3:
-            self._send_to_station(connection, "Usage: /share <file_id> <callsign>\n> ")
-            return
-
-        try:
-            file_id = int(parts[1])
-        except ValueError:
-            self._send_to_station(connection, "Invalid file ID. Must be a number.\n> ")
-            return
-
-        shared_with_callsign = parts[2].upper()
+        shared_with_callsign = args[0].upper()
 
         success, error = self.file_manager.share_file(
             file_id,
@@ -950,67 +1424,43 @@ File Information:
         )
 
         if success:
-            self._send_to_station(connection, f"File shared with {shared_with_callsign}.\n> ")
+            self._send_with_prompt(connection, f"File shared with {shared_with_callsign}.")
         else:
-            self._send_to_station(connection, f"Error: {error}\n> ")
+            self._send_error(connection, error)
 
-    def _handle_publicfile_command(self, connection: AX25Connection, message: str):
+    def _handle_publicfile_command(self, connection: AX25Connection, file_id: int, args: list):
         """Handle /publicfile command - make file public"""
-        parts = message.split()
-
-        if len(parts) < 2:
-            self._send_to_station(connection, "Usage: /publicfile <file_id>\n> ")
-            return
-
-        try:
-            file_id = int(parts[1])
-        except ValueError:
-            self._send_to_station(connection, "Invalid file ID. Must be a number.\n> ")
-            return
-
         success, error = self.file_manager.set_file_public(file_id, connection.remote_address)
 
         if success:
-            self._send_to_station(connection, f"File {file_id} is now public.\n> ")
+            self._send_with_prompt(connection, f"File {file_id} is now public.")
         else:
-            self._send_to_station(connection, f"Error: {error}\n> ")
+            self._send_error(connection, error)
 
-    def _handle_deletefile_command(self, connection: AX25Connection, message: str):
+    def _handle_deletefile_command(self, connection: AX25Connection, file_id: int, args: list):
         """Handle /deletefile command - delete a file"""
-        parts = message.split()
-
-        if len(parts) < 2:
-            self._send_to_station(connection, "Usage: /deletefile <file_id>\n> ")
-            return
-
-        try:
-            file_id = int(parts[1])
-        except ValueError:
-            self._send_to_station(connection, "Invalid file ID. Must be a number.\n> ")
-            return
-
         success, error = self.file_manager.delete_file(file_id, connection.remote_address)
 
         if success:
-            self._send_to_station(connection, f"File {file_id} deleted.\n> ")
+            self._send_with_prompt(connection, f"File {file_id} deleted.")
         else:
-            self._send_to_station(connection, f"Error: {error}\n> ")
+            self._send_error(connection, error)
 
-    def _handle_upload_command(self, connection: AX25Connection, message: str):
+    def _handle_upload_command(self, connection: AX25Connection, args: list):
         """Handle /upload command - start file upload"""
         if isinstance(connection, TelnetConnection):
-            self._send_to_station(connection,
+            self._send_with_prompt(connection,
                 "YAPP file upload is only supported over AX.25 connections.\n"
-                "Please use Packet Commander or another AX.25 client to upload files.\n> "
+                "Please use Packet Commander or another AX.25 client to upload files."
             )
             return
 
         # Start YAPP upload
-        self._send_to_station(connection, "Ready to receive file via YAPP. Send ENQ to start.\n")
+        self._send_to_station(connection, _UPLOAD_READY)
         success = self.connection_handler.start_yapp_upload(connection)
 
         if not success:
-            self._send_to_station(connection, "Failed to start upload.\n> ")
+            self._send_to_station(connection, _UPLOAD_FAILED)
 
     def _on_yapp_data(self, connection: AX25Connection, data: bytes):
         """Handle incoming YAPP data"""
@@ -1026,7 +1476,9 @@ File Information:
                 if transfer.is_upload:
                     # File was uploaded to us
                     filename = transfer.header.filename if transfer.header else "unknown.dat"
-                    file_data = bytes(transfer.file_data)
+                    # Hashing, compression and the SQLite blob all take the
+                    # bytearray directly, so don't copy the whole upload
+                    file_data = transfer.file_data
 
                     # Save file
                     file_id, error = self.file_manager.upload_file(
@@ -1037,22 +1489,22 @@ File Information:
                     )
 
                     if error:
-                        self._send_to_station(connection, f"\nUpload failed: {error}\n> ")
+                        self._send_with_prompt(connection, f"\nUpload failed: {error}")
                     else:
-                        self._send_to_station(connection,
+                        self._send_with_prompt(connection,
                             f"\nFile uploaded successfully!\n"
                             f"File ID: {file_id}\n"
                             f"Filename: {filename}\n"
                             f"Size: {self.file_manager.format_file_size(len(file_data))}\n"
                             f"Use /publicfile {file_id} to make it public.\n"
-                            f"Use /share {file_id} <callsign> to share it.\n> "
+                            f"Use /share {file_id} <callsign> to share it."
                         )
 
                         logger.info(f"File uploaded via YAPP: {filename} by {connection.remote_address}")
 
                 else:
                     # File was downloaded from us
-                    self._send_to_station(connection, "\nDownload complete!\n> ")
+                    self._send_to_station(connection, _DOWNLOAD_DONE)
                     logger.info(f"File downloaded via YAPP by {connection.remote_address}")
 
                 # Reset YAPP mode
@@ -1060,12 +1512,17 @@ File Information:
 
             elif transfer and transfer.is_error():
                 # Transfer error
-                self._send_to_station(connection, "\nFile transfer failed or was cancelled.\n> ")
+                self._send_to_station(connection, _TRANSFER_FAILED)
                 connection.in_yapp_mode = False
 
+        except (ValueError, IndexError) as e:
+            # Malformed packet from the station - expected, no traceback
+            logger.warning("Bad YAPP data from %s: %s", connection.remote_address, e)
+            self._send_to_station(connection, _TRANSFER_ERROR)
+            connection.in_yapp_mode = False
         except Exception as e:
-            logger.error(f"Error handling YAPP data: {e}", exc_info=True)
-            self._send_to_station(connection, "\nFile transfer error.\n> ")
+            logger.error("Error handling YAPP data: %r", e, exc_info=self._want_traceback())
+            self._send_to_station(connection, _TRANSFER_ERROR)
             connection.in_yapp_mode = False
 
     def stop(self):
@@ -1075,9 +1532,15 @@ File Information:
 
         logger.info("Stopping PacketClaude...")
         self.running = False
+        self._shutdown_evt.set()
+        self._wakeup()
 
         self.activity_logger.log_shutdown()
 
+        # Abandon queued Claude queries; in-flight ones finish in the background
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
         # Disconnect all connections
         if self.connection_handler:
             for conn in self.connection_handler.get_all_connections():
@@ -1087,6 +1550,20 @@ File Information:
         if self.telnet_server:
             self.telnet_server.stop()
 
+        # Give in-flight Claude queries a bounded time to finish, so the
+        # rows they log make it into the final flush
+        if self.executor:
+            with self._pending_lock:
+                inflight = list(self._query_futures)
+            if inflight:
+                _, not_done = wait(inflight, timeout=QUERY_SHUTDOWN_GRACE)
+                if not_done:
+                    logger.warning(f"{len(not_done)} Claude queries still running at shutdown; "
+                                   f"their logs will not be written")
+
+        # Write any query and disconnection logs still buffered
+        self._flush_logs()
+
         # Disconnect from radio
         if self.radio_control:
             self.radio_control.disconnect()
@@ -1095,6 +1572,10 @@ File Information:
         if self.kiss_client:
             self.kiss_client.disconnect()
 
+        # Close pooled database connections (after the final log flush)
+        if self.database:
+            self.database.close()
+
         logger.info("PacketClaude stopped")
 
 
@@ -1166,7 +1647,7 @@ Examples:
     args = parser.parse_args()
 
     # Validate environment
-    if not _validate_environment():
+    if not _validate_environment(args.config):
         sys.exit(1)
 
     try:
@@ -1188,25 +1669,25 @@ Examples:
         sys.exit(1)
 
 
-def _validate_environment() -> bool:
+def _validate_environment(config_path: Optional[str] = None) -> bool:
     """
     Validate environment before starting
 
+    Args:
+        config_path: Config file given on the command line, if any
+
     Returns:
         True if environment is valid
     """
-    from pathlib import Path
-    import os
-
     # Check for config file
-    config_path = os.getenv("CONFIG_PATH", "config/config.yaml")
-    if not Path(config_path).exists():
+    config_path = config_path or os.getenv("CONFIG_PATH", DEFAULT_CONFIG_PATH)
+    if not os.path.exists(config_path):
         print(f"Error: Configuration file not found: {config_path}", file=sys.stderr)
         print("Please copy config/config.yaml.example to config/config.yaml and configure it", file=sys.stderr)
         return False
 
     # Check for .env file
-    if not Path(".env").exists():
+    if not os.path.exists(".env"):
         print("Warning: .env file not found", file=sys.stderr)
         print("Please copy .env.example to .env and add your Anthropic API key", file=sys.stderr)
         print("Or set ANTHROPIC_API_KEY environment variable", file=sys.stderr)
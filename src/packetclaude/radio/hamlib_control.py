@@ -3,7 +3,8 @@ Hamlib radio control for PTT and radio status
 Gracefully handles when Hamlib is not available
 """
 import logging
-from typing import Optional
+import threading
+from typing import ClassVar, Dict, Optional
 
 
 logger = logging.getLogger(__name__)
@@ -18,6 +19,9 @@ except ImportError:
     HAMLIB_AVAILABLE = False
     logger.warning("Hamlib not available - radio control disabled")
 
+# PTT state labels for debug logging, indexed by the bool state
+_PTT_STR = ("OFF", "ON")
+
 
 class RadioControl:
     """
@@ -25,10 +29,23 @@ class RadioControl:
     Provides PTT control and radio status monitoring
     """
 
+    # Known radio model names -> Hamlib model numbers.
+    # This is a simplified version - in reality, you'd need to
+    # look up the exact model number from Hamlib's rig list.
+    # Keys are casefolded once here so lookups are case-insensitive
+    _MODEL_MAP: ClassVar[Dict[str, int]] = {name.casefold(): num for name, num in {
+        'FTX-1': 1044,  # Yaesu FTX-1 (example - verify actual number)
+        'FT-817': 120,
+        'FT-818': 1043,
+        'IC-705': 3085,
+        'IC-7300': 3073,
+    }.items()}
+
     def __init__(self, model: str = "FTX-1",
                  device: str = "/dev/ttyUSB0",
                  baud: int = 4800,
-                 enabled: bool = True):
+                 enabled: bool = True,
+                 ptt_hang_ms: int = 0):
         """
         Initialize radio control
 
@@ -37,6 +54,9 @@ class RadioControl:
             device: Serial device path
             baud: Baud rate
             enabled: Enable radio control
+            ptt_hang_ms: Opt-in delay before a PTT release reaches the rig; a
+                key-up within this window cancels it (0, the default, releases
+                immediately)
         """
         self.model = model
         self.device = device
@@ -45,6 +65,19 @@ class RadioControl:
         self.rig = None
         self.connected = False
 
+        # enabled and connected with an open rig, checked once per call
+        self._live = False
+
+        # PTT hangtime: releases are deferred so a burst of frames keys the
+        # rig once instead of toggling it (a serial round-trip) per frame
+        self.ptt_hang = max(0, ptt_hang_ms) / 1000
+        self._ptt_on = False
+        self._ptt_release: Optional[threading.Timer] = None
+        self._ptt_lock = threading.Lock()
+
+        # Resolved once; connect() may be retried
+        self._model_num = self._get_model_number() if self.enabled else 0
+
         if not HAMLIB_AVAILABLE and enabled:
             logger.warning(
                 "Radio control requested but Hamlib not available. "
@@ -67,12 +100,9 @@ class RadioControl:
             return False
 
         try:
-            # Map model name to Hamlib model number
-            model_num = self._get_model_number()
-
             # Initialize rig
             Hamlib.rig_set_debug(Hamlib.RIG_DEBUG_NONE)
-            self.rig = Hamlib.Rig(model_num)
+            self.rig = Hamlib.Rig(self._model_num)
 
             # Set parameters
             self.rig.state.rigport.pathname = self.device
@@ -81,6 +111,7 @@ class RadioControl:
             # Open connection
             self.rig.open()
             self.connected = True
+            self._live = True
 
             logger.info(f"Connected to {self.model} on {self.device}")
             return True
@@ -88,10 +119,18 @@ class RadioControl:
         except Exception as e:
             logger.error(f"Failed to connect to radio: {e}")
             self.connected = False
+            self._live = False
             return False
 
     def disconnect(self):
         """Disconnect from radio"""
+        with self._ptt_lock:
+            # Don't leave the rig keyed while a deferred release is pending
+            self._cancel_ptt_release()
+            if self._ptt_on and self._live:
+                self._apply_ptt(False)
+            self._ptt_on = False
+            self._live = False
         if self.rig and self.connected:
             try:
                 self.rig.close()
@@ -112,17 +151,61 @@ class RadioControl:
         Returns:
             True if successful
         """
-        if not self.enabled:
-            return True
-
-        if not self.connected or not self.rig:
+        if not self._live:
+            if not self.enabled:
+                return True
             logger.warning("Cannot set PTT: not connected to radio")
             return False
 
+        with self._ptt_lock:
+            if state:
+                # Key-up inside the hang window: the rig never unkeyed
+                self._cancel_ptt_release()
+                if self._ptt_on:
+                    return True
+                return self._apply_ptt(True)
+
+            if not self._ptt_on or self._ptt_release:
+                return True
+            if not self.ptt_hang:
+                return self._apply_ptt(False)
+
+            self._ptt_release = threading.Timer(self.ptt_hang, self._release_ptt)
+            self._ptt_release.daemon = True
+            self._ptt_release.start()
+            return True
+
+    def _release_ptt(self):
+        """Hangtime expired - unkey the rig"""
+        with self._ptt_lock:
+            # A key-up may have cancelled this timer after it fired
+            if self._ptt_release is not threading.current_thread():
+                return
+            self._ptt_release = None
+            if self._ptt_on and self._live:
+                self._apply_ptt(False)
+
+    def _cancel_ptt_release(self):
+        """Cancel a pending deferred release (caller holds _ptt_lock)"""
+        if self._ptt_release:
+            self._ptt_release.cancel()
+            self._ptt_release = None
+
+    def _apply_ptt(self, state: bool) -> bool:
+        """
+        Send a PTT change to the rig (caller holds _ptt_lock)
+
+        Args:
+            state: True for transmit, False for receive
+
+        Returns:
+            True if successful
+        """
         try:
             ptt_value = Hamlib.RIG_PTT_ON if state else Hamlib.RIG_PTT_OFF
             self.rig.set_ptt(Hamlib.RIG_VFO_CURR, ptt_value)
-            logger.debug(f"PTT {'ON' if state else 'OFF'}")
+            self._ptt_on = state
+            logger.debug("PTT %s", _PTT_STR[state])
             return True
         except Exception as e:
             logger.error(f"Failed to set PTT: {e}")
@@ -135,11 +218,8 @@ class RadioControl:
         Returns:
             True if transmitting, False if receiving, None if error
         """
-        if not self.enabled:
-            return False
-
-        if not self.connected or not self.rig:
-            return None
+        if not self._live:
+            return None if self.enabled else False
 
         try:
             ptt = self.rig.get_ptt(Hamlib.RIG_VFO_CURR)
@@ -155,7 +235,7 @@ class RadioControl:
         Returns:
             Frequency in Hz or None if error
         """
-        if not self.enabled or not self.connected or not self.rig:
+        if not self._live:
             return None
 
         try:
@@ -175,7 +255,7 @@ class RadioControl:
         Returns:
             True if successful
         """
-        if not self.enabled or not self.connected or not self.rig:
+        if not self._live:
             return False
 
         try:
@@ -193,7 +273,7 @@ class RadioControl:
         Returns:
             Signal strength in dB or None if error
         """
-        if not self.enabled or not self.connected or not self.rig:
+        if not self._live:
             return None
 
         try:
@@ -210,7 +290,7 @@ class RadioControl:
         Returns:
             Radio info string or None if error
         """
-        if not self.enabled or not self.connected or not self.rig:
+        if not self._live:
             return None
 
         try:
@@ -230,28 +310,17 @@ class RadioControl:
         if not HAMLIB_AVAILABLE:
             return 0
 
-        # Try to match model name
-        model_upper = self.model.upper()
+        # YAML may hand us a bare model number as an int
+        model = str(self.model).strip()
 
         # Check if it's already a number
-        try:
-            return int(self.model)
-        except ValueError:
-            pass
+        if model.lstrip('-').isdigit():
+            return int(model)
 
         # Try to find model by name
-        # This is a simplified version - in reality, you'd need to
-        # look up the exact model number from Hamlib's rig list
-        model_map = {
-            'FTX-1': 1044,  # Yaesu FTX-1 (example - verify actual number)
-            'FT-817': 120,
-            'FT-818': 1043,
-            'IC-705': 3085,
-            'IC-7300': 3073,
-        }
-
-        if model_upper in model_map:
-            return model_map[model_upper]
+        model_num = self._MODEL_MAP.get(model.casefold())
+        if model_num is not None:
+            return model_num
 
         # Default to dummy rig for testing
         logger.warning(
@@ -287,7 +356,7 @@ class DummyRadioControl:
         pass
 
     def set_ptt(self, state: bool) -> bool:
-        logger.debug(f"[DUMMY] PTT {'ON' if state else 'OFF'}")
+        logger.debug("[DUMMY] PTT %s", _PTT_STR[bool(state)])
         return True
 
     def get_ptt(self) -> bool:
@@ -297,7 +366,7 @@ class DummyRadioControl:
         return 144390000.0  # 2m APRS frequency
 
     def set_frequency(self, freq_hz: float) -> bool:
-        logger.debug(f"[DUMMY] Set frequency to {freq_hz} Hz")
+        logger.debug("[DUMMY] Set frequency to %s Hz", freq_hz)
         return True
 
     def get_signal_strength(self) -> Optional[int]:
@@ -2,11 +2,20 @@
 Telnet server for PacketClaude
 Provides TCP/telnet access for testing and debugging
 """
+import selectors
 import socket
+import struct
+import sys
 import threading
+import heapq
+import itertools
 import logging
+import os
+import re
 import time
-from typing import Optional, Callable, Dict
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, Dict, List, Tuple
 from enum import Enum
 
 
@@ -26,6 +35,45 @@ SE = b'\xf0'  # Subnegotiation End
 TELOPT_ENVIRON = b'\x24'  # RFC 1408 - Old Environment Option
 TELOPT_NEW_ENVIRON = b'\x27'  # RFC 1572 - New Environment Option
 
+# One IAC sequence, in order of preference: a complete subnegotiation
+# (option and payload captured), WILL/WONT/DO/DONT + option, a doubled
+# IAC (literal 0xFF), or any other two-byte command. The trailing
+# optional byte also swallows a lone IAC at the end of a read
+_IAC_RE = re.compile(rb'\xff(?:\xfa(.)(.*?)\xf0|[\xfb-\xfe].?|\xff|.?)', re.S)
+
+# One input line and its CRLF, CR or LF terminator
+_LINE_RE = re.compile(rb'([^\r\n]*)(?:\r\n|\r|\n)')
+
+# Largest single read from a client
+RECV_SIZE = 4096
+
+# TCP keepalive: probe after 60 s idle, every 20 s, give up after 3 misses.
+# Unacknowledged output is abandoned after 120 s. A dead peer then shows
+# up in the event loop as a failed recv(), without waiting for the idle
+# sweep. Options missing on this platform are skipped
+KEEPALIVE_OPTIONS = (
+    ('TCP_KEEPIDLE', 60),
+    ('TCP_KEEPINTVL', 20),
+    ('TCP_KEEPCNT', 3),
+    ('TCP_USER_TIMEOUT', 120000),  # milliseconds, Linux only
+)
+
+# Coarse monotonic clock for activity stamps. The event loop refreshes it
+# after every select(), so it is never much more than a second behind,
+# which is plenty for idle timeouts measured in minutes
+_coarse_now = time.monotonic()
+
+# Subnegotiation options carrying environment variables
+ENVIRON_OPTS = {0x24: "ENVIRON", 0x27: "NEW-ENVIRON"}
+
+# ENVIRON subnegotiation codes (RFC 1572)
+ENV_VAR = 0
+ENV_VALUE = 1
+ENV_ESC = 2
+ENV_USERVAR = 3
+ENV_NAME_START = frozenset({ENV_VAR, ENV_USERVAR})
+ENV_DELIMS = frozenset({ENV_VAR, ENV_VALUE, ENV_ESC, ENV_USERVAR})
+
 
 class ConnectionState(Enum):
     """Connection states"""
@@ -49,15 +97,34 @@ class TelnetConnection:
         self.address = address
         self.state = ConnectionState.CONNECTED
         self.connected_at = time.time()
-        self.last_activity = time.time()
+        self.connected_mono = time.monotonic()  # monotonic, for durations
+        self.last_activity = self.connected_mono  # monotonic, for stale checks
         self.packets_sent = 0
         self.packets_received = 0
         self.connection_id: Optional[int] = None
 
+        # Bytes received but not yet terminated by a newline
+        self._rx_buffer = bytearray()
+
+        # Callbacks waiting to run for this connection, in arrival order;
+        # at most one pool worker drains them at a time
+        self._events: deque = deque()
+        self._events_lock = threading.Lock()
+        self._events_running = False
+
+        # Output coalescing: while corked, send() appends here and the
+        # last uncork() writes everything in one sendall
+        self._tx_lock = threading.Lock()
+        self._tx_buf = bytearray()
+        self._cork_depth = 0
+
         # Callsign detection
         self.callsign: Optional[str] = None  # Detected callsign from telnet login
         self._remote_address = f"{address[0]}:{address[1]}"  # Default identifier
 
+        # Connection table key; cached because close() resets fileno() to -1
+        self._fd = client_socket.fileno()
+
     @property
     def remote_address(self) -> str:
         """Get remote address string - returns callsign if detected, otherwise IP:port"""
@@ -70,7 +137,7 @@ class TelnetConnection:
 
     def send(self, data: bytes) -> bool:
         """
-        Send data to client
+        Send data to client (buffered while the connection is corked)
 
         Args:
             data: Data to send
@@ -78,15 +145,79 @@ class TelnetConnection:
         Returns:
             True if successful
         """
+        with self._tx_lock:
+            if self._cork_depth:
+                self._tx_buf += data
+                return True
+            return self._write(data)
+
+    def cork(self):
+        """Hold back sends until the matching uncork()"""
+        with self._tx_lock:
+            self._cork_depth += 1
+
+    def uncork(self) -> bool:
+        """
+        Release one cork(); the outermost one flushes buffered output
+
+        Returns:
+            True if successful
+        """
+        with self._tx_lock:
+            if self._cork_depth:
+                self._cork_depth -= 1
+            if self._cork_depth:
+                return True
+            return self._flush_locked()
+
+    def _flush_locked(self) -> bool:
+        """Write out buffered output (caller holds _tx_lock)"""
+        if not self._tx_buf:
+            return True
+        # sendall() takes the bytearray as is; the lock keeps it from
+        # growing underneath the write, so no copy is needed
+        ok = self._write(self._tx_buf)
+        self._tx_buf.clear()
+        return ok
+
+    def _write(self, data: bytes) -> bool:
+        """Write data to the socket (caller holds _tx_lock)"""
         try:
             self.socket.sendall(data)
             self.packets_sent += 1
-            self.last_activity = time.time()
+            self.last_activity = _coarse_now
             return True
         except Exception as e:
             logger.error(f"Error sending to {self.remote_address}: {e}")
             return False
 
+    def drain(self, timeout: float = 1.0) -> bool:
+        """
+        Make sure data already sent reaches the client before close()
+
+        Half-closes the socket so the FIN follows the queued output, and
+        turns on SO_LINGER so the final close() waits (up to timeout) for
+        the client to acknowledge it instead of the caller sleeping.
+
+        Args:
+            timeout: Longest close() may block, in seconds
+
+        Returns:
+            True if the socket was set up to drain
+        """
+        # Anything still corked has to go out ahead of the FIN
+        with self._tx_lock:
+            self._cork_depth = 0
+            self._flush_locked()
+        try:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER,
+                                   struct.pack('ii', 1, max(1, int(timeout))))
+            self.socket.shutdown(socket.SHUT_WR)
+            return True
+        except OSError as e:
+            logger.debug(f"Could not drain {self.remote_address}: {e}")
+            return False
+
     def close(self):
         """Close the connection"""
         try:
@@ -111,7 +242,7 @@ class TelnetConnection:
             callsign: User's callsign or login name
         """
         if callsign and callsign.strip():
-            self.callsign = callsign.strip().upper()
+            self.callsign = sys.intern(callsign.strip().upper())
             logger.info(f"Connection {self._remote_address} identified as {self.callsign}")
 
     def __str__(self):
@@ -136,8 +267,37 @@ class TelnetServer:
         self.port = port
         self.server_socket: Optional[socket.socket] = None
         self.running = False
-        self.connections: Dict[str, TelnetConnection] = {}
-        self.accept_thread: Optional[threading.Thread] = None
+        # Keyed by socket fd: a small int, unaffected by callsign changes
+        self.connections: Dict[int, TelnetConnection] = {}
+        self._connections_lock = threading.Lock()
+
+        # Min-heap of (last_activity, seq, conn) for stale cleanup. Entries
+        # are not updated on activity; a popped entry whose connection has
+        # been active since is pushed back with the newer timestamp
+        self._activity_heap: List[Tuple[float, int, TelnetConnection]] = []
+        self._heap_lock = threading.Lock()
+        self._heap_seq = itertools.count()
+
+        # One reactor thread multiplexes the listening socket and every
+        # client, instead of an accept thread plus a thread per connection
+        self._selector: Optional[selectors.BaseSelector] = None
+        self.loop_thread: Optional[threading.Thread] = None
+
+        # Only the event loop thread reads, so every client shares one
+        # receive buffer instead of allocating a bytes object per recv()
+        self._rx_buf = bytearray(RECV_SIZE)
+        self._rx_view = memoryview(self._rx_buf)
+
+        # Lets stop() interrupt a blocked select()
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        self._wakeup_recv.setblocking(False)
+        self._wakeup_send.setblocking(False)
+
+        # Callbacks run here so a slow one never stalls the event loop
+        self._callback_pool = ThreadPoolExecutor(
+            max_workers=min(32, (os.cpu_count() or 1) * 4),
+            thread_name_prefix='telnet-cb'
+        )
 
         # Callbacks
         self.on_connect: Optional[Callable[[TelnetConnection], None]] = None
@@ -156,13 +316,19 @@ class TelnetServer:
             self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             self.server_socket.bind((self.host, self.port))
             self.server_socket.listen(5)
-            self.server_socket.settimeout(1.0)  # Allow periodic checks
+            self.server_socket.setblocking(False)
+
+            # Listening and wakeup sockets carry their handler; clients
+            # carry their connection
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(self.server_socket, selectors.EVENT_READ, self._accept)
+            self._selector.register(self._wakeup_recv, selectors.EVENT_READ, self._drain_wakeup)
 
             self.running = True
 
-            # Start accept thread
-            self.accept_thread = threading.Thread(target=self._accept_loop, daemon=True)
-            self.accept_thread.start()
+            # Start the event loop
+            self.loop_thread = threading.Thread(target=self._event_loop, daemon=True)
+            self.loop_thread.start()
 
             logger.info(f"Telnet server listening on {self.host}:{self.port}")
             return True
@@ -182,63 +348,135 @@ class TelnetServer:
 
         # Close server socket
         if self.server_socket:
+            self._unregister(self.server_socket)
             try:
                 self.server_socket.close()
             except Exception as e:
                 logger.error(f"Error closing server socket: {e}")
 
-        # Wait for accept thread
-        if self.accept_thread:
-            self.accept_thread.join(timeout=2.0)
+        # Wake the event loop so it sees running is off
+        try:
+            self._wakeup_send.send(b'\x00')
+        except OSError:
+            pass
+        if self.loop_thread:
+            self.loop_thread.join(timeout=2.0)
+
+        if self._selector:
+            self._selector.close()
+        self._wakeup_recv.close()
+        self._wakeup_send.close()
+
+        # Let queued callbacks (and the closes behind them) finish
+        self._callback_pool.shutdown(wait=True)
 
         logger.info("Telnet server stopped")
 
-    def _accept_loop(self):
-        """Accept incoming connections"""
+    def _event_loop(self):
+        """Wait for readable sockets and dispatch them until stopped"""
+        global _coarse_now
         while self.running:
             try:
-                client_socket, address = self.server_socket.accept()
-                logger.info(f"New telnet connection from {address}")
+                events = self._selector.select(timeout=1.0)
+            except (OSError, ValueError) as e:
+                # Selector closed underneath us during stop()
+                if self.running:
+                    logger.error(f"Telnet event loop error: {e}")
+                break
 
-                # Create connection object
-                conn = TelnetConnection(client_socket, address)
+            # One clock read per wakeup instead of one per recv/send
+            _coarse_now = time.monotonic()
 
-                # Set socket timeout so recv() doesn't block forever
-                client_socket.settimeout(5.0)
+            for key, _ in events:
+                if isinstance(key.data, TelnetConnection):
+                    self._on_client_readable(key.data)
+                else:
+                    key.data()
 
-                # Request environment variables from client
-                # Try both old ENVIRON (RFC 1408) and NEW-ENVIRON (RFC 1572)
-                # macOS telnet uses the older ENVIRON option
-                try:
-                    logger.debug(f"Sending IAC DO ENVIRON and NEW-ENVIRON to {address}")
-                    # Request old ENVIRON first (more widely supported)
-                    client_socket.sendall(IAC + DO + TELOPT_ENVIRON)
-                    # Also request NEW-ENVIRON
-                    client_socket.sendall(IAC + DO + TELOPT_NEW_ENVIRON)
-                    logger.debug(f"Sent telnet environment requests to {address}")
-                except Exception as e:
-                    logger.warning(f"Could not request telnet environment: {e}")
+    def _drain_wakeup(self):
+        """Consume pending wakeup bytes"""
+        try:
+            while self._wakeup_recv.recv(64):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _unregister(self, sock: socket.socket):
+        """Stop watching a socket (safe if it was never registered)"""
+        try:
+            self._selector.unregister(sock)
+        except (KeyError, ValueError, AttributeError):
+            pass
 
-                self.connections[conn._remote_address] = conn
+    def _accept(self):
+        """Accept an incoming connection"""
+        try:
+            client_socket, address = self.server_socket.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            if self.running:
+                logger.error(f"Error accepting connection: {e}")
+            return
 
-                # Start receive thread for this connection
-                recv_thread = threading.Thread(
-                    target=self._receive_loop,
-                    args=(conn,),
-                    daemon=True
-                )
-                recv_thread.start()
+        try:
+            logger.info(f"New telnet connection from {address}")
 
-                # Notify callback
-                if self.on_connect:
-                    self.on_connect(conn)
+            # Create connection object
+            conn = TelnetConnection(client_socket, address)
 
-            except socket.timeout:
-                # Normal timeout, continue
-                continue
+            # The selector only reads when data is waiting; the timeout
+            # bounds sendall() from worker threads on a stalled client
+            client_socket.settimeout(5.0)
+
+            # Output is coalesced explicitly (see TelnetConnection.cork),
+            # so don't let Nagle hold back the single write
+            client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            # Let the kernel detect vanished peers
+            self._enable_keepalive(client_socket)
+
+            # Request environment variables from client
+            # Try both old ENVIRON (RFC 1408) and NEW-ENVIRON (RFC 1572)
+            # macOS telnet uses the older ENVIRON option
+            try:
+                logger.debug(f"Sending IAC DO ENVIRON and NEW-ENVIRON to {address}")
+                # Request old ENVIRON first (more widely supported),
+                # then NEW-ENVIRON, in a single segment
+                client_socket.sendall(IAC + DO + TELOPT_ENVIRON + IAC + DO + TELOPT_NEW_ENVIRON)
+                logger.debug(f"Sent telnet environment requests to {address}")
             except Exception as e:
-                if self.running:
-                    logger.error(f"Error accepting connection: {e}")
+                logger.warning(f"Could not request telnet environment: {e}")
+
+            with self._connections_lock:
+                self.connections[conn._fd] = conn
+            with self._heap_lock:
+                heapq.heappush(self._activity_heap, (conn.last_activity, next(self._heap_seq), conn))
+            self._selector.register(client_socket, selectors.EVENT_READ, conn)
+
+            # Notify callback
+            if self.on_connect:
+                self._dispatch(conn, self.on_connect, conn)
+
+        except Exception as e:
+            logger.error(f"Error accepting connection: {e}")
+
+    @staticmethod
+    def _enable_keepalive(sock: socket.socket):
+        """
+        Turn on TCP keepalive with the KEEPALIVE_OPTIONS timings
+
+        Args:
+            sock: Client socket
+        """
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            for name, value in KEEPALIVE_OPTIONS:
+                option = getattr(socket, name, None)
+                if option is not None:
+                    sock.setsockopt(socket.IPPROTO_TCP, option, value)
+        except OSError as e:
+            logger.debug(f"Could not enable keepalive: {e}")
 
     def _parse_telnet_data(self, conn: TelnetConnection, data: bytes) -> bytes:
         """
@@ -255,50 +493,23 @@ class TelnetServer:
         if IAC not in data:
             return data
 
-        logger.debug(f"Found IAC in data from {conn._remote_address}, parsing telnet protocol")
+        logger.debug("Found IAC in data from %s, parsing telnet protocol", conn._remote_address)
 
-        result = b""
-        i = 0
-        while i < len(data):
-            if data[i:i+1] == IAC:
-                if i + 1 < len(data):
-                    cmd = data[i+1:i+2]
-
-                    # Handle subnegotiation (SB ... SE)
-                    if cmd == SB and i + 2 < len(data):
-                        option = data[i+2:i+3]
-
-                        # Find SE (end of subnegotiation)
-                        se_pos = data.find(SE, i + 3)
-                        if se_pos != -1:
-                            if option in (TELOPT_ENVIRON, TELOPT_NEW_ENVIRON):
-                                # Parse environment variables (both old and new formats)
-                                env_data = data[i+3:se_pos]
-                                option_name = "NEW-ENVIRON" if option == TELOPT_NEW_ENVIRON else "ENVIRON"
-                                logger.debug(f"Found {option_name} subnegotiation from {conn._remote_address}")
-                                self._parse_environ(conn, env_data)
-                            i = se_pos + 1
-                            continue
-
-                    # Skip IAC commands (WILL, WONT, DO, DONT)
-                    if cmd in (WILL, WONT, DO, DONT):
-                        i += 3  # IAC + CMD + OPTION
-                        continue
-
-                    # Double IAC means literal 0xFF
-                    if cmd == IAC:
-                        result += IAC
-                        i += 2
-                        continue
-
-                    i += 2
-                else:
-                    i += 1
-            else:
-                result += data[i:i+1]
-                i += 1
+        def strip(match: re.Match) -> bytes:
+            if match.group() == b'\xff\xff':
+                # Double IAC means literal 0xFF
+                return IAC
+            option = match.group(1)
+            if option is not None:
+                option_name = ENVIRON_OPTS.get(option[0])
+                if option_name:
+                    # Parse environment variables (both old and new formats)
+                    logger.debug("Found %s subnegotiation from %s", option_name, conn._remote_address)
+                    self._parse_environ(conn, match.group(2))
+            return b""
 
-        return result
+        # One C-level pass removes every sequence
+        return _IAC_RE.sub(strip, data)
 
     def _parse_environ(self, conn: TelnetConnection, env_data: bytes):
         """
@@ -309,26 +520,23 @@ class TelnetServer:
             env_data: Environment data from subnegotiation
         """
         # Environment variable format: VAR name VALUE value ...
-        # VAR = 0, VALUE = 1, ESC = 2, USERVAR = 3
-        VAR = 0
-        VALUE = 1
-
+        n = len(env_data)
         i = 0
-        while i < len(env_data):
-            if env_data[i] == VAR or env_data[i] == 3:  # VAR or USERVAR
+        while i < n:
+            if env_data[i] in ENV_NAME_START:  # VAR or USERVAR
                 # Read variable name
                 i += 1
                 name_start = i
-                while i < len(env_data) and env_data[i] not in (VAR, VALUE, 2, 3):
+                while i < n and env_data[i] not in ENV_DELIMS:
                     i += 1
                 var_name = env_data[name_start:i].decode('ascii', errors='ignore')
 
                 # Read value if present
                 var_value = ""
-                if i < len(env_data) and env_data[i] == VALUE:
+                if i < n and env_data[i] == ENV_VALUE:
                     i += 1
                     value_start = i
-                    while i < len(env_data) and env_data[i] not in (VAR, VALUE, 2, 3):
+                    while i < n and env_data[i] not in ENV_DELIMS:
                         i += 1
                     var_value = env_data[value_start:i].decode('ascii', errors='ignore')
 
@@ -336,68 +544,122 @@ class TelnetServer:
                 if var_name.upper() in ('USER', 'LOGNAME') and var_value:
                     logger.info(f"Detected telnet login for {conn._remote_address}: {var_value}")
                     conn.set_callsign(var_value)
-
-                    # Update connection key in dictionary
-                    if conn._remote_address in self.connections:
-                        del self.connections[conn._remote_address]
-                        self.connections[conn.remote_address] = conn
                     break
             else:
                 i += 1
 
-    def _receive_loop(self, conn: TelnetConnection):
+    def _on_client_readable(self, conn: TelnetConnection):
         """
-        Receive data from a connection
+        Read whatever a client has sent and dispatch complete lines
 
         Args:
-            conn: Connection to receive from
+            conn: Connection with data waiting
+        """
+        try:
+            # Receive data
+            n = conn.socket.recv_into(self._rx_view)
+        except (BlockingIOError, InterruptedError, socket.timeout):
+            return
+        except OSError as e:
+            logger.error(f"Error receiving from {conn.remote_address}: {e}")
+            self._handle_disconnect(conn)
+            return
+
+        if not n:
+            # Connection closed
+            logger.debug(f"Connection closed by {conn.remote_address}")
+            self._handle_disconnect(conn)
+            return
+
+        try:
+            # Parse telnet protocol data; plain text (the usual case) is
+            # appended straight from the shared buffer with no copy
+            if self._rx_buf.find(IAC, 0, n) < 0:
+                data = self._rx_view[:n]
+            else:
+                data = self._parse_telnet_data(conn, bytes(self._rx_view[:n]))
+
+            # Grown and consumed in place, so a slow trickle of input
+            # doesn't recopy the whole pending line on every read
+            buffer = conn._rx_buffer
+            buffer += data
+            conn.last_activity = _coarse_now
+
+            # Process line by line
+            consumed = 0
+            for match in _LINE_RE.finditer(buffer):
+                consumed = match.end()
+                line = match.group(1)
+
+                if line:
+                    conn.packets_received += 1
+
+                    # Notify callback
+                    if self.on_data:
+                        self._dispatch(conn, self.on_data, conn, line)
+
+            # Keep only the unterminated tail
+            if consumed:
+                del buffer[:consumed]
+
+        except Exception as e:
+            logger.error(f"Error receiving from {conn.remote_address}: {e}")
+            self._handle_disconnect(conn)
+
+    def _dispatch(self, conn: TelnetConnection, callback: Callable, *args):
+        """
+        Queue a callback for a connection on the callback pool
+
+        Callbacks for one connection run in order, never concurrently.
+
+        Args:
+            conn: Connection the event belongs to
+            callback: Function to call
+            *args: Arguments for the callback
+        """
+        with conn._events_lock:
+            conn._events.append((callback, args))
+            if conn._events_running:
+                return
+            conn._events_running = True
+
+        try:
+            self._callback_pool.submit(self._run_events, conn)
+        except RuntimeError:
+            # Pool already shut down (late event during stop)
+            self._run_events(conn)
+
+    def _run_events(self, conn: TelnetConnection):
         """
-        buffer = b""
+        Run a connection's queued callbacks until none are left
 
+        Args:
+            conn: Connection to run callbacks for
+        """
+        # Replies to everything drained in this pass go out in one write
+        conn.cork()
         try:
-            while self.running and conn.state == ConnectionState.CONNECTED:
+            while True:
+                with conn._events_lock:
+                    if not conn._events:
+                        conn._events_running = False
+                        return
+                    callback, args = conn._events.popleft()
+
                 try:
-                    # Receive data
-                    data = conn.socket.recv(4096)
-
-                    if not data:
-                        # Connection closed
-                        logger.debug(f"Connection closed by {conn.remote_address}")
-                        break
-
-                    # Parse telnet protocol data
-                    data = self._parse_telnet_data(conn, data)
-
-                    buffer += data
-                    conn.last_activity = time.time()
-
-                    # Process line by line
-                    while b'\n' in buffer or b'\r' in buffer:
-                        # Split on newline or carriage return
-                        if b'\r\n' in buffer:
-                            line, buffer = buffer.split(b'\r\n', 1)
-                        elif b'\n' in buffer:
-                            line, buffer = buffer.split(b'\n', 1)
-                        elif b'\r' in buffer:
-                            line, buffer = buffer.split(b'\r', 1)
-                        else:
-                            break
-
-                        if line:
-                            conn.packets_received += 1
-
-                            # Notify callback
-                            if self.on_data:
-                                self.on_data(conn, line)
-
-                except socket.timeout:
-                    continue
+                    callback(*args)
                 except Exception as e:
-                    logger.error(f"Error receiving from {conn.remote_address}: {e}")
-                    break
-
+                    logger.error(f"Error in telnet callback for {conn.remote_address}: {e}", exc_info=True)
         finally:
-            self._handle_disconnect(conn)
+            conn.uncork()
+
+    def _close_connection(self, conn: TelnetConnection):
+        """Notify the disconnect callback, then close the socket"""
+        if self.on_disconnect:
+            self.on_disconnect(conn)
+
+        # Close (may linger briefly if drain() was called)
+        conn.close()
 
     def _handle_disconnect(self, conn: TelnetConnection):
         """
@@ -406,16 +668,22 @@ class TelnetServer:
         Args:
             conn: Connection that disconnected
         """
-        if conn.remote_address in self.connections:
-            logger.info(f"Telnet disconnection from {conn.remote_address}")
+        # Remove first: the event loop, disconnect() and stop() can race
+        # here, and only the caller that takes the entry out handles it.
+        # The identity check guards against a reused fd's new connection
+        with self._connections_lock:
+            if self.connections.get(conn._fd) is not conn:
+                return
+            del self.connections[conn._fd]
 
-            # Notify callback
-            if self.on_disconnect:
-                self.on_disconnect(conn)
+        logger.info(f"Telnet disconnection from {conn.remote_address}")
 
-            # Close and remove
-            conn.close()
-            del self.connections[conn.remote_address]
+        # Must happen before close(), while the socket still has its fd
+        self._unregister(conn.socket)
+
+        # Queued behind any pending data callbacks, so on_disconnect comes
+        # last and the socket is open for their replies
+        self._dispatch(conn, self._close_connection, conn)
 
     def send_data(self, conn: TelnetConnection, data: bytes) -> bool:
         """
@@ -434,6 +702,19 @@ class TelnetServer:
 
         return conn.send(data)
 
+    def send_data_async(self, conn: TelnetConnection, data: bytes):
+        """
+        Send data to a connection from the callback pool
+
+        Ordered with the connection's callbacks, so the caller never
+        blocks on a slow client.
+
+        Args:
+            conn: Connection to send to
+            data: Data to send
+        """
+        self._dispatch(conn, self.send_data, conn, data)
+
     def disconnect(self, conn: TelnetConnection):
         """
         Disconnect a connection
@@ -451,6 +732,21 @@ class TelnetServer:
         """Get list of all active connections"""
         return list(self.connections.values())
 
+    def get_by_address(self, address: str) -> Optional[TelnetConnection]:
+        """
+        Find a connection by callsign or IP:port (linear scan, admin use)
+
+        Args:
+            address: Callsign or IP:port string
+
+        Returns:
+            Matching connection, or None
+        """
+        for conn in list(self.connections.values()):
+            if conn.remote_address == address or conn._remote_address == address:
+                return conn
+        return None
+
     def cleanup_stale_connections(self, timeout: int = 300):
         """
         Remove connections that have been inactive
@@ -458,14 +754,28 @@ class TelnetServer:
         Args:
             timeout: Inactivity timeout in seconds
         """
-        now = time.time()
+        cutoff = time.monotonic() - timeout
         stale = []
 
-        for key, conn in self.connections.items():
-            if now - conn.last_activity > timeout:
-                stale.append(key)
+        with self._heap_lock:
+            heap = self._activity_heap
+            # Only entries older than the cutoff are looked at
+            while heap and heap[0][0] < cutoff:
+                _, _, conn = heapq.heappop(heap)
+                if self.connections.get(conn._fd) is not conn:
+                    continue  # Already disconnected
+                if conn.last_activity < cutoff:
+                    stale.append(conn)
+                else:
+                    heapq.heappush(heap, (conn.last_activity, next(self._heap_seq), conn))
+
+            # Entries for closed connections age out above; rebuild if
+            # a burst of short connections has left too many behind
+            if len(heap) > 4 * len(self.connections) + 16:
+                heap[:] = [(c.last_activity, next(self._heap_seq), c)
+                           for c in list(self.connections.values())]
+                heapq.heapify(heap)
 
-        for key in stale:
-            conn = self.connections[key]
+        for conn in stale:
             logger.info(f"Removing stale telnet connection: {conn}")
             self._handle_disconnect(conn)
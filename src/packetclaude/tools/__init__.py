@@ -2,9 +2,24 @@
 Tools for Claude AI
 Provides additional capabilities like web search, POTA spots, DX Cluster, and BBS session management
 """
-from .web_search import WebSearchTool
-from .pota_spots import POTASpotsTool
-from .bbs_session import BBSSessionTool
-from .dx_cluster import DXClusterTool
+import importlib
 
 __all__ = ['WebSearchTool', 'POTASpotsTool', 'BBSSessionTool', 'DXClusterTool']
+
+# Resolved on first access so importing one tool module doesn't load the
+# others (and their HTTP client dependencies)
+_EXPORTS = {
+    'WebSearchTool': '.web_search',
+    'POTASpotsTool': '.pota_spots',
+    'BBSSessionTool': '.bbs_session',
+    'DXClusterTool': '.dx_cluster',
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -216,22 +216,17 @@ This tool provides complete BBS system control and information.
             })
 
         # Find the telnet connection
-        for conn in self.app.telnet_server.get_all_connections():
-            if conn.remote_address == connection_id or conn._remote_address == connection_id:
-                old_callsign = conn.remote_address
-                conn.set_callsign(callsign)
+        conn = self.app.telnet_server.get_by_address(connection_id)
+        if conn:
+            old_callsign = conn.remote_address
+            conn.set_callsign(callsign)
 
-                # Update connections dictionary
-                if conn._remote_address in self.app.telnet_server.connections:
-                    del self.app.telnet_server.connections[conn._remote_address]
-                    self.app.telnet_server.connections[conn.remote_address] = conn
-
-                return json.dumps({
-                    "success": True,
-                    "message": f"Callsign updated from {old_callsign} to {callsign}",
-                    "old_callsign": old_callsign,
-                    "new_callsign": callsign
-                })
+            return json.dumps({
+                "success": True,
+                "message": f"Callsign updated from {old_callsign} to {callsign}",
+                "old_callsign": old_callsign,
+                "new_callsign": callsign
+            })
 
         return json.dumps({
             "success": False,
@@ -384,11 +379,10 @@ This tool provides complete BBS system control and information.
 
         # Check telnet connections
         if not disconnected and self.app.telnet_server:
-            for conn in self.app.telnet_server.get_all_connections():
-                if conn.remote_address == connection_id or conn._remote_address == connection_id:
-                    self.app.telnet_server.disconnect(conn)
-                    disconnected = True
-                    break
+            conn = self.app.telnet_server.get_by_address(connection_id)
+            if conn:
+                self.app.telnet_server.disconnect(conn)
+                disconnected = True
 
         if disconnected:
             return json.dumps({
@@ -418,16 +412,16 @@ This tool provides complete BBS system control and information.
 
         # Check telnet connections
         if self.app.telnet_server:
-            for conn in self.app.telnet_server.get_all_connections():
-                if conn.remote_address == connection_id or conn._remote_address == connection_id:
-                    return {
-                        "type": "telnet",
-                        "callsign": conn.remote_address,
-                        "state": conn.state.value,
-                        "connected_at": datetime.fromtimestamp(conn.connected_at).isoformat(),
-                        "packets_sent": conn.packets_sent,
-                        "packets_received": conn.packets_received,
-                        "ip_address": conn._remote_address
-                    }
+            conn = self.app.telnet_server.get_by_address(connection_id)
+            if conn:
+                return {
+                    "type": "telnet",
+                    "callsign": conn.remote_address,
+                    "state": conn.state.value,
+                    "connected_at": datetime.fromtimestamp(conn.connected_at).isoformat(),
+                    "packets_sent": conn.packets_sent,
+                    "packets_received": conn.packets_received,
+                    "ip_address": conn._remote_address
+                }
 
         return None